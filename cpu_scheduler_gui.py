@@ -1,26 +1,226 @@
+import os
+import queue
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
-import matplotlib
-matplotlib.use('Agg')  # Set backend before other imports
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from tabulate import tabulate
-import numpy as np
-import copy
+from importlib import import_module
+from tkinter import ttk, messagebox, filedialog
 
-plt.style.use('ggplot')
+# The scheduler package loads numpy and the engines on first use of a name
+import scheduler
+from scheduler import LABELS
+from scheduler.profiling import Profiler, phase
+
+# Plotting and table modules, bound by load_plotting() on first use so the
+# window appears without waiting for matplotlib
+np = plt = FigureCanvasTkAgg = NavigationToolbar2Tk = PolyCollection = tabulate = None
+merge_adjacent = visible_bars = None
+_plotting_lock = threading.Lock()
+
+
+def load_plotting():
+    # Safe to call from any thread; the GUI starts it in the background once
+    # the window is up, so it has usually finished by the first Simulate
+    global np, plt, FigureCanvasTkAgg, NavigationToolbar2Tk, PolyCollection, tabulate
+    global merge_adjacent, visible_bars
+    with _plotting_lock:
+        if tabulate is not None:
+            return
+        import numpy as np
+        import matplotlib
+        matplotlib.use('Agg')  # Set backend before other imports
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        from matplotlib.collections import PolyCollection
+        from scheduler.gantt import merge_adjacent, visible_bars
+        plt.style.use('ggplot')
+        from tabulate import tabulate
+
+class GanttChart:
+    # All bars live in one PolyCollection that is re-sampled to screen
+    # resolution whenever the visible time window changes (zoom/pan).
+    # Multi-core schedules get one lane per core.
+    MAX_LABELS = 50
+    MIN_LABEL_PIXELS = 20
+    MAX_LEGEND = 20
+
+    def __init__(self, master, gantt, task_ids=None):
+        # The segment columns may be memory-mapped; only visible ones are read.
+        # Each core's lane is a slice of them, so nothing is copied up front.
+        lanes = [gantt.lane(core) for core in range(gantt.cores)]
+        self.lanes = [(lane.task, lane.start, lane.end) for lane in lanes]
+
+        # Create color mapping
+        self.task_ids = np.unique(gantt.task if task_ids is None else task_ids)
+        self.colors = plt.cm.tab10(np.linspace(0, 1, len(self.task_ids)))
+
+        self.fig = plt.figure(figsize=(10, 3))
+        self.ax = self.fig.add_subplot(111)
+        self.bars = PolyCollection([], edgecolor='black', linewidth=0.5)
+        self.ax.add_collection(self.bars)
+        self.labels = []
+
+        # Format chart
+        if len(self.lanes) > 1:
+            self.ax.set_yticks(np.arange(len(self.lanes)) + 0.5)
+            self.ax.set_yticklabels([f'CPU {lane}' for lane in range(len(self.lanes))], fontsize=8)
+        else:
+            self.ax.set_yticks([])
+        self.ax.set_xlabel('Time Units')
+        self.ax.set_title('Gantt Chart')
+        self.ax.grid(True, axis='x', linestyle='--', alpha=0.7)
+
+        # Set axis limits
+        max_time = max(int(end[-1]) for _, _, end in self.lanes if len(end))
+        self.ax.set_xlim(0, max_time * 1.05)
+        self.ax.set_ylim(0, len(self.lanes))
+
+        # Add legend
+        if len(self.task_ids) <= self.MAX_LEGEND:
+            legend_handles = [plt.Rectangle((0,0),1,1, fc=color) for color in self.colors]
+            self.ax.legend(legend_handles, [f'P{task}' for task in self.task_ids],
+                           loc='upper right', fontsize=8)
+
+        # Embed in Tkinter
+        self.canvas = FigureCanvasTkAgg(self.fig, master=master)
+        NavigationToolbar2Tk(self.canvas, master).update()
+        self.render()
+        self.ax.callbacks.connect('xlim_changed', lambda ax: self.render())
+        self.canvas.draw()
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+    def render(self):
+        t0, t1 = self.ax.get_xlim()
+        pixels = max(int(self.ax.bbox.width), 1)
+        bars = [merge_adjacent(*visible_bars(*lane, t0, t1, pixels)) for lane in self.lanes]
+        lane = np.repeat(np.arange(len(bars)), [len(bar[0]) for bar in bars])
+        task, start, end = (np.concatenate(column) for column in zip(*bars))
+
+        verts = np.empty((len(task), 4, 2))
+        verts[:, :2, 0] = start[:, None]
+        verts[:, 2:, 0] = end[:, None]
+        verts[:, 0::3, 1] = lane[:, None] + 0.1
+        verts[:, 1:3, 1] = lane[:, None] + 0.9
+        self.bars.set_verts(verts)
+        self.bars.set_facecolor(self.colors[np.searchsorted(self.task_ids, task)])
+        # Outlines would swamp pixel-wide bars
+        self.bars.set_linewidth(0.5 if len(task) <= self.MAX_LABELS else 0)
+
+        # Task labels and time markers only while they stay readable
+        for text in self.labels:
+            text.remove()
+        self.labels = []
+        if len(task) <= self.MAX_LABELS:
+            min_width = self.MIN_LABEL_PIXELS * (t1 - t0) / pixels
+            for i, (task_id, seg_start, seg_end, y) in enumerate(zip(task.tolist(), start.tolist(),
+                                                                     end.tolist(), lane.tolist())):
+                if seg_end - seg_start >= min_width:
+                    self.labels.append(self.ax.text((seg_start + seg_end) / 2, y + 0.5, f"P{task_id}",
+                                                    ha='center', va='center', color='white', fontsize=8))
+                if len(self.lanes) > 1:
+                    continue
+                if i == 0:
+                    self.labels.append(self.ax.text(seg_start, -0.2, str(seg_start),
+                                                    ha='left', va='top', fontsize=8))
+                self.labels.append(self.ax.text(seg_end, -0.2, str(seg_end),
+                                                ha='right', va='top', fontsize=8))
+        self.canvas.draw_idle()
+
+class VirtualTaskList:
+    # Treeview that only materialises the rows currently in view. Rows are read
+    # from a live sequence and re-filled whenever the view scrolls or resizes.
+    ROW_HEIGHT = 20
+    HEADER_HEIGHT = 25
+
+    def __init__(self, master, columns, rows, width=80):
+        self.rows = rows
+        self.offset = 0
+        self.page = 6
+
+        self.scrollbar = ttk.Scrollbar(master, orient=tk.VERTICAL, command=self.on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree = ttk.Treeview(master, columns=columns, show='headings', height=self.page)
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=width, anchor=tk.CENTER)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+        self.tree.bind('<Configure>', self.on_resize)
+        self.tree.bind('<MouseWheel>', lambda e: self.scroll_to(self.offset - e.delta // 120 * 3))
+        self.tree.bind('<Button-4>', lambda e: self.scroll_to(self.offset - 3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll_to(self.offset + 3))
+
+    def on_scroll(self, action, value, unit=None):
+        if action == 'moveto':
+            self.scroll_to(int(float(value) * len(self.rows)))
+        elif action == 'scroll':
+            self.scroll_to(self.offset + int(value) * (self.page if unit == 'pages' else 1))
+
+    def on_resize(self, event):
+        page = max(1, (event.height - self.HEADER_HEIGHT) // self.ROW_HEIGHT)
+        if page != self.page:
+            self.page = page
+            self.refresh()
+
+    def scroll_to(self, offset):
+        self.offset = max(0, min(offset, len(self.rows) - self.page))
+        self.refresh()
+
+    def show(self, rows):
+        self.rows = rows
+        self.scroll_to(0)
+
+    def refresh(self):
+        self.tree.delete(*self.tree.get_children())
+        for row in self.rows[self.offset:self.offset + self.page]:
+            self.tree.insert('', 'end', values=row)
+        n = len(self.rows)
+        if n > self.page:
+            self.scrollbar.set(self.offset / n, (self.offset + self.page) / n)
+        else:
+            self.scrollbar.set(0, 1)
+
+class ResultRows:
+    # Per-task result rows of a schedule in arrival order, converted only for
+    # the slice a VirtualTaskList asks for
+    COLUMNS = ('ID', 'Arrival', 'Burst', 'Priority', 'Start', 'Finish', 'Turnaround', 'Waiting',
+               'Response')
+
+    def __init__(self, schedule):
+        table = schedule.table
+        self.order = table.order
+        self.columns = (table.id, table.arrival, table.burst, table.priority, schedule.start,
+                        schedule.finish, schedule.turnaround, schedule.waiting, schedule.response)
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, index):
+        rows = self.order[index]
+        return list(zip(*(column[rows].tolist() for column in self.columns)))
 
 class CPUSchedulerGUI:
+    POLL_MS = 50
+    STATS = ('Avg', 'P50', 'P95', 'P99', 'Max')
+
     def __init__(self, root):
         self.root = root
         self.root.title("CPU Scheduling Simulator")
         self.root.geometry("1000x800")
         
-        self.tasks = []
+        self.tasks = []  # (id, arrival, burst, priority) rows
+        self.task_ids = set()
+        self.table = None
+        self.cache = None  # created on first Simulate
+        self.runners = {}  # algorithm -> IncrementalRunner for the last quantum
         self.current_id = 1
         self.current_figure = None
+        self.result = None  # (schedule, algorithm, quantum) on display
+        self.profiler = None  # instrumentation of the current run, with Diagnostics on
+        self.diagnostics_text = None
+        self.job = None
         
         self.create_widgets()
+        self.root.after_idle(self.preload)
         
     def create_widgets(self):
         # Main container
@@ -52,30 +252,28 @@ class CPUSchedulerGUI:
         self.add_btn = ttk.Button(input_frame, text="Add Task", command=self.add_task)
         self.add_btn.grid(row=0, column=8, padx=10)
 
+        self.import_btn = ttk.Button(input_frame, text="Import...", command=self.import_tasks)
+        self.import_btn.grid(row=0, column=9, padx=2)
+
+        self.open_btn = ttk.Button(input_frame, text="Open Schedule...", command=self.open_schedule)
+        self.open_btn.grid(row=0, column=10, padx=2)
+
+        self.save_btn = ttk.Button(input_frame, text="Save Schedule...", command=self.save_schedule)
+        self.save_btn.grid(row=0, column=11, padx=2)
+
         # Task List Frame
         list_frame = ttk.LabelFrame(main_frame, text="Task List", padding=10)
         list_frame.pack(fill=tk.BOTH, expand=True, pady=5)
         
         columns = ('ID', 'Arrival', 'Burst', 'Priority')
-        self.task_list = ttk.Treeview(list_frame, columns=columns, show='headings', height=6)
-        for col in columns:
-            self.task_list.heading(col, text=col)
-            self.task_list.column(col, width=80, anchor=tk.CENTER)
-        self.task_list.pack(fill=tk.BOTH, expand=True)
+        self.task_list = VirtualTaskList(list_frame, columns, self.tasks)
 
         # Algorithm Selection Frame
         algo_frame = ttk.LabelFrame(main_frame, text="Scheduling Algorithm", padding=10)
         algo_frame.pack(fill=tk.X, pady=5)
         
         self.algo_var = tk.StringVar()
-        algorithms = [
-            "First-Come, First-Served (FCFS)",
-            "Shortest Job First (SJF)",
-            "Priority (Non-Preemptive)",
-            "Priority (Preemptive)",
-            "Round Robin (RR)",
-            "Shortest Remaining Time First (SRTF)"
-        ]
+        algorithms = list(LABELS.values())
         
         self.algo_menu = ttk.Combobox(algo_frame, textvariable=self.algo_var, values=algorithms, width=30)
         self.algo_menu.current(0)
@@ -90,9 +288,35 @@ class CPUSchedulerGUI:
         self.quantum_label.pack_forget()
         self.quantum.pack_forget()
 
+        self.sweep_label = ttk.Label(algo_frame, text="Sweep:")
+        self.sweep_range = ttk.Entry(algo_frame, width=8)
+        self.sweep_range.insert(0, "1:10")
+        self.sweep_btn = ttk.Button(algo_frame, text="Sweep Quantum", command=self.sweep)
+
+        self.compare_btn = ttk.Button(algo_frame, text="Compare All", command=self.compare_all)
+        self.compare_btn.pack(side=tk.RIGHT, padx=5)
+
         self.simulate_btn = ttk.Button(algo_frame, text="Simulate", command=self.simulate)
         self.simulate_btn.pack(side=tk.RIGHT, padx=5)
 
+        # Simulated CPUs; more than one runs the multi-core engine
+        self.stealing = tk.BooleanVar(value=False)
+        ttk.Checkbutton(algo_frame, text="Work stealing",
+                        variable=self.stealing).pack(side=tk.RIGHT, padx=5)
+        self.cores = ttk.Entry(algo_frame, width=4)
+        self.cores.insert(0, "1")
+        self.cores.pack(side=tk.RIGHT)
+        ttk.Label(algo_frame, text="Cores:").pack(side=tk.RIGHT, padx=5)
+
+        # Per-phase timings and engine counters of each run in a separate window
+        self.diagnostics = tk.BooleanVar(value=False)
+        ttk.Checkbutton(algo_frame, text="Diagnostics",
+                        variable=self.diagnostics).pack(side=tk.RIGHT, padx=5)
+
+        # Shown only while a simulation runs
+        self.cancel_btn = ttk.Button(algo_frame, text="Cancel", command=self.cancel_job)
+        self.progress_bar = ttk.Progressbar(algo_frame, length=120, maximum=100)
+
         # Results and Gantt Frame
         results_gantt_frame = ttk.Frame(main_frame)
         results_gantt_frame.pack(fill=tk.BOTH, expand=True)
@@ -101,30 +325,53 @@ class CPUSchedulerGUI:
         results_frame = ttk.LabelFrame(results_gantt_frame, text="Results", padding=10)
         results_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
         
-        self.results_text = tk.Text(results_frame, height=10, wrap=tk.WORD)
-        scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.results_text.yview)
+        summary_frame = ttk.Frame(results_frame)
+        summary_frame.pack(fill=tk.BOTH, expand=True)
+        self.results_text = tk.Text(summary_frame, height=10, wrap=tk.WORD)
+        scrollbar = ttk.Scrollbar(summary_frame, orient=tk.VERTICAL, command=self.results_text.yview)
         self.results_text.configure(yscrollcommand=scrollbar.set)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.results_text.pack(fill=tk.BOTH, expand=True)
 
+        # Per-task results of the last run, one page of rows at a time
+        table_frame = ttk.Frame(results_frame)
+        table_frame.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
+        self.result_list = VirtualTaskList(table_frame, ResultRows.COLUMNS, (), width=60)
+
         # Gantt Chart Frame
         self.gantt_frame = ttk.LabelFrame(results_gantt_frame, text="Gantt Chart", padding=10)
         self.gantt_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=5)
 
+    def preload(self):
+        # Once the window is drawn, import what the first run will need
+        def work():
+            load_plotting()
+            for module in ('scheduler.cache', 'scheduler.incremental', 'scheduler.metrics'):
+                import_module(module)
+
+        threading.Thread(target=work, daemon=True).start()
+
     def toggle_options(self, event=None):
         selected = self.algo_var.get()
+        sweep_widgets = (self.sweep_label, self.sweep_range, self.sweep_btn)
         if "Round Robin" in selected:
             self.quantum_label.pack(side=tk.LEFT, padx=5)
             self.quantum.pack(side=tk.LEFT, padx=5)
+            for widget in sweep_widgets:
+                widget.pack(side=tk.LEFT, padx=5)
             self.priority.grid_remove()
         elif "Priority" in selected:
             self.priority.grid()
             self.quantum_label.pack_forget()
             self.quantum.pack_forget()
+            for widget in sweep_widgets:
+                widget.pack_forget()
         else:
             self.priority.grid_remove()
             self.quantum_label.pack_forget()
             self.quantum.pack_forget()
+            for widget in sweep_widgets:
+                widget.pack_forget()
 
     def add_task(self):
         try:
@@ -133,23 +380,14 @@ class CPUSchedulerGUI:
             burst = int(self.burst_time.get())
             priority = int(self.priority.get()) if self.priority.grid_info() else 0
             
-            if any(t['id'] == task_id for t in self.tasks):
+            if task_id in self.task_ids:
                 messagebox.showerror("Error", "Task ID must be unique!")
                 return
 
-            task = {
-                'id': task_id,
-                'arrival': arrival,
-                'burst': burst,
-                'priority': priority,
-                'remaining': burst,
-                'start': -1,
-                'finish': -1,
-                'response': -1
-            }
-            
-            self.tasks.append(task)
-            self.task_list.insert('', 'end', values=(task_id, arrival, burst, priority))
+            self.tasks.append((task_id, arrival, burst, priority))
+            self.task_ids.add(task_id)
+            self.table = None
+            self.task_list.refresh()
             
             self.current_id += 1
             self.task_id.delete(0, tk.END)
@@ -158,6 +396,41 @@ class CPUSchedulerGUI:
         except ValueError:
             messagebox.showerror("Error", "Invalid input values!")
 
+    def import_tasks(self):
+        path = filedialog.askopenfilename(
+            title="Import Workload",
+            filetypes=[("Workloads", "*.csv *.json *.jsonl *.ndjson"),
+                       ("Scheduler traces", "*.txt *.trace *.csv"), ("All files", "*.*")])
+        if not path:
+            return
+
+        # Parse on the worker thread; IDs are checked against the task set.
+        # Jobs reconstructed from a perf/ftrace trace are numbered after the
+        # existing tasks.
+        first_id = max(self.task_ids, default=0) + 1
+
+        def work(progress):
+            if not scheduler.trace_format(path):
+                return scheduler.read_tasks(path, self.task_ids, progress)
+            table = scheduler.load_trace(path).table
+            ids = range(first_id, first_id + len(table))
+            return list(zip(ids, table.arrival.tolist(), table.burst.tolist(),
+                            table.priority.tolist()))
+
+        self.start_job(work, self.add_tasks, "Import Error")
+
+    def add_tasks(self, rows):
+        if not rows:
+            return
+        self.tasks.extend(rows)
+        self.task_ids.update(row[0] for row in rows)
+        self.table = None
+        self.task_list.refresh()
+
+        self.current_id = max(self.task_ids) + 1
+        self.task_id.delete(0, tk.END)
+        self.task_id.insert(0, str(self.current_id))
+
     def simulate(self):
         if not self.tasks:
             messagebox.showerror("Error", "No tasks added!")
@@ -170,349 +443,368 @@ class CPUSchedulerGUI:
             messagebox.showerror("Error", "Invalid quantum value!")
             return
 
+        cores = self.get_cores()
+        if cores is None:
+            return
+        stealing = self.stealing.get()
+
         # Run selected algorithm
-        try:
-            if "FCFS" in algorithm:
-                result = self.fcfs(copy.deepcopy(self.tasks))
-            elif "SJF" in algorithm:
-                result = self.sjf(copy.deepcopy(self.tasks))
-            elif "Priority (Non-Preemptive)" in algorithm:
-                result = self.priority_non_preemptive(copy.deepcopy(self.tasks))
-            elif "Priority (Preemptive)" in algorithm:
-                result = self.priority_preemptive(copy.deepcopy(self.tasks))
-            elif "Round Robin" in algorithm:
-                result = self.round_robin(copy.deepcopy(self.tasks), quantum)
-            elif "SRTF" in algorithm:
-                result = self.srtf(copy.deepcopy(self.tasks))
-        except Exception as e:
-            messagebox.showerror("Simulation Error", str(e))
+        names = {label: key for key, label in LABELS.items()}
+        name = names.get(algorithm, algorithm)
+        profiler = self.profiler = Profiler() if self.diagnostics.get() else None
+        with phase(profiler, 'table'):
+            table = self.get_table()
+        with phase(profiler, 'cache'):
+            cache = self.get_cache()
+            schedule = cache.get(table, name, quantum, cores, stealing)
+        if schedule is not None:
+            self.display_results(schedule, name, quantum)
             return
 
-        self.display_results(result['tasks'], result['gantt'])
+        # Resume from the previous run of this algorithm when tasks were only
+        # appended or edited; metrics, and caching the result (which may write
+        # it to disk), run off the Tk thread too
+        def work(progress):
+            counters = None if profiler is None else profiler.engine(name)
+            with phase(profiler, 'simulate'):
+                if cores > 1:
+                    schedule = scheduler.smp(table, name, cores, quantum, stealing, progress,
+                                             counters)
+                else:
+                    # One runner per algorithm: a new quantum starts it afresh,
+                    # so checkpoints never pile up across quanta tried
+                    runner = self.runners.get(name)
+                    if runner is None or runner.quantum != quantum:
+                        runner = self.runners[name] = scheduler.IncrementalRunner(name, quantum)
+                    schedule = runner.run(table, progress, counters)
+            with phase(profiler, 'cache'):
+                cache.put(table, name, quantum, schedule, cores, stealing)
+            with phase(profiler, 'metrics'):
+                return schedule, scheduler.describe(schedule)
 
-    # Scheduling algorithms (same as before)
-    def fcfs(self, tasks):
-        tasks.sort(key=lambda x: x['arrival'])
-        current_time = 0
-        gantt = []
-        
-        for task in tasks:
-            if current_time < task['arrival']:
-                current_time = task['arrival']
-            
-            task['start'] = current_time
-            task['response'] = current_time - task['arrival']
-            gantt.append({'task': task['id'], 'start': current_time, 'end': current_time + task['burst']})
-            
-            current_time += task['burst']
-            task['finish'] = current_time
-            task['remaining'] = 0
-            task['turnaround'] = task['finish'] - task['arrival']
-            task['waiting'] = task['turnaround'] - task['burst']
-        
-        return {'tasks': tasks, 'gantt': gantt}
-    
-    def sjf(self, tasks):
-        tasks.sort(key=lambda x: x['arrival'])
-        current_time = 0
-        gantt = []
-        ready_queue = []
-        i = 0
-        n = len(tasks)
-        
-        while i < n or ready_queue:
-            while i < n and tasks[i]['arrival'] <= current_time:
-                ready_queue.append(tasks[i])
-                i += 1
-            
-            if not ready_queue:
-                current_time = tasks[i]['arrival']
-                continue
-                
-            ready_queue.sort(key=lambda x: x['burst'])
-            task = ready_queue.pop(0)
-            
-            if task['start'] == -1:
-                task['start'] = current_time
-                task['response'] = current_time - task['arrival']
-            
-            gantt.append({'task': task['id'], 'start': current_time, 'end': current_time + task['burst']})
-            current_time += task['burst']
-            task['finish'] = current_time
-            task['remaining'] = 0
-            task['turnaround'] = task['finish'] - task['arrival']
-            task['waiting'] = task['turnaround'] - task['burst']
-        
-        return {'tasks': tasks, 'gantt': gantt}
-    
-    def priority_non_preemptive(self, tasks):
-        tasks.sort(key=lambda x: x['arrival'])
-        current_time = 0
-        gantt = []
-        ready_queue = []
-        i = 0
-        n = len(tasks)
-        
-        while i < n or ready_queue:
-            while i < n and tasks[i]['arrival'] <= current_time:
-                ready_queue.append(tasks[i])
-                i += 1
-            
-            if not ready_queue:
-                current_time = tasks[i]['arrival']
-                continue
-                
-            ready_queue.sort(key=lambda x: x['priority'])
-            task = ready_queue.pop(0)
-            
-            if task['start'] == -1:
-                task['start'] = current_time
-                task['response'] = current_time - task['arrival']
-            
-            gantt.append({'task': task['id'], 'start': current_time, 'end': current_time + task['burst']})
-            current_time += task['burst']
-            task['finish'] = current_time
-            task['remaining'] = 0
-            task['turnaround'] = task['finish'] - task['arrival']
-            task['waiting'] = task['turnaround'] - task['burst']
-        
-        return {'tasks': tasks, 'gantt': gantt}
-    
-    def priority_preemptive(self, tasks):
-        tasks.sort(key=lambda x: x['arrival'])
-        current_time = 0
-        gantt = []
-        ready_queue = []
-        i = 0
-        n = len(tasks)
-        prev_task = None
-        
-        for task in tasks:
-            task['remaining'] = task['burst']
-        
-        while i < n or ready_queue:
-            while i < n and tasks[i]['arrival'] <= current_time:
-                ready_queue.append(tasks[i])
-                i += 1
-            
-            if not ready_queue:
-                current_time = tasks[i]['arrival']
-                continue
-                
-            ready_queue.sort(key=lambda x: x['priority'])
-            task = ready_queue[0]
-            
-            if prev_task and prev_task != task and prev_task['remaining'] > 0:
-                gantt.append({'task': prev_task['id'], 'start': prev_task['start_time'], 'end': current_time})
-            
-            if prev_task != task:
-                if task['start'] == -1:
-                    task['start'] = current_time
-                    task['response'] = current_time - task['arrival']
-                task['start_time'] = current_time
-            
-            task['remaining'] -= 1
-            current_time += 1
-            prev_task = task
-            
-            if task['remaining'] == 0:
-                ready_queue.pop(0)
-                task['finish'] = current_time
-                gantt.append({'task': task['id'], 'start': task['start_time'], 'end': current_time})
-                task['turnaround'] = task['finish'] - task['arrival']
-                task['waiting'] = task['turnaround'] - task['burst']
-        
-        return {'tasks': tasks, 'gantt': gantt}
-    
-    def round_robin(self, tasks, quantum):
-        tasks.sort(key=lambda x: x['arrival'])
-        current_time = 0
-        gantt = []
-        ready_queue = []
-        i = 0
-        n = len(tasks)
-        
-        for task in tasks:
-            task['remaining'] = task['burst']
-        
-        while i < n or ready_queue:
-            while i < n and tasks[i]['arrival'] <= current_time:
-                ready_queue.append(tasks[i])
-                i += 1
-            
-            if not ready_queue:
-                current_time = tasks[i]['arrival']
-                continue
-                
-            task = ready_queue.pop(0)
-            
-            if task['start'] == -1:
-                task['start'] = current_time
-                task['response'] = current_time - task['arrival']
-            
-            exec_time = min(quantum, task['remaining'])
-            gantt.append({'task': task['id'], 'start': current_time, 'end': current_time + exec_time})
-            
-            current_time += exec_time
-            task['remaining'] -= exec_time
-            
-            while i < n and tasks[i]['arrival'] <= current_time:
-                ready_queue.append(tasks[i])
-                i += 1
-                
-            if task['remaining'] > 0:
-                ready_queue.append(task)
-            else:
-                task['finish'] = current_time
-                task['turnaround'] = task['finish'] - task['arrival']
-                task['waiting'] = task['turnaround'] - task['burst']
-        
-        return {'tasks': tasks, 'gantt': gantt}
-    
-    def srtf(self, tasks):
-        tasks.sort(key=lambda x: x['arrival'])
-        current_time = 0
-        gantt = []
-        ready_queue = []
-        i = 0
-        n = len(tasks)
-        prev_task = None
-        
-        for task in tasks:
-            task['remaining'] = task['burst']
-        
-        while i < n or ready_queue:
-            while i < n and tasks[i]['arrival'] <= current_time:
-                ready_queue.append(tasks[i])
-                i += 1
-            
-            if not ready_queue:
-                current_time = tasks[i]['arrival']
-                continue
-                
-            ready_queue.sort(key=lambda x: x['remaining'])
-            task = ready_queue[0]
-            
-            if prev_task and prev_task != task and prev_task['remaining'] > 0:
-                gantt.append({'task': prev_task['id'], 'start': prev_task['start_time'], 'end': current_time})
-            
-            if prev_task != task:
-                if task['start'] == -1:
-                    task['start'] = current_time
-                    task['response'] = current_time - task['arrival']
-                task['start_time'] = current_time
-            
-            task['remaining'] -= 1
-            current_time += 1
-            prev_task = task
-            
-            if task['remaining'] == 0:
-                ready_queue.pop(0)
-                task['finish'] = current_time
-                gantt.append({'task': task['id'], 'start': task['start_time'], 'end': current_time})
-                task['turnaround'] = task['finish'] - task['arrival']
-                task['waiting'] = task['turnaround'] - task['burst']
-        
-        return {'tasks': tasks, 'gantt': gantt}
-    
+        def done(result):
+            schedule, details = result
+            self.display_results(schedule, name, quantum, details)
 
-    def display_results(self, tasks, gantt):
-        # Clear previous results
-        self.results_text.delete(1.0, tk.END)
-        
-        if not tasks:
-            messagebox.showerror("Error", "No results to display!")
+        self.start_job(work, done)
+
+    def open_schedule(self):
+        path = filedialog.askopenfilename(
+            title="Open Schedule", filetypes=[("Schedules", "*.sched"), ("All files", "*.*")])
+        if not path:
             return
 
-        # Calculate metrics
-        total_waiting = sum(t['waiting'] for t in tasks)
-        total_turnaround = sum(t['turnaround'] for t in tasks)
-        total_response = sum(t['response'] for t in tasks)
-        n = len(tasks)
-        completion_time = max(t['finish'] for t in tasks) if tasks else 0
-
-        # Prepare results text
-        results_text = "SCHEDULING RESULTS\n" + "="*50 + "\n"
+        profiler = self.profiler = Profiler() if self.diagnostics.get() else None
+
+        def work(progress):
+            with phase(profiler, 'open'):
+                header = scheduler.read_header(path)
+                schedule = scheduler.read_schedule(path)
+            with phase(profiler, 'metrics'):
+                details = scheduler.describe(schedule)
+            return schedule, header['algorithm'], header['quantum'], details
+
+        self.start_job(work, lambda result: self.display_results(*result), "Open Error")
+
+    def save_schedule(self):
+        if self.result is None:
+            messagebox.showerror("Error", "No results to save!")
+            return
+        path = filedialog.asksaveasfilename(
+            title="Save Schedule", defaultextension=".sched",
+            filetypes=[("Schedules", "*.sched"), ("All files", "*.*")])
+        if not path:
+            return
+
+        schedule, algorithm, quantum = self.result
+        self.start_job(
+            lambda progress: scheduler.write_schedule(path, schedule, algorithm, quantum),
+            lambda result: None, "Save Error")
+
+    def compare_all(self):
+        if not self.tasks:
+            messagebox.showerror("Error", "No tasks added!")
+            return
+
+        try:
+            quantum = int(self.quantum.get())
+        except ValueError:
+            messagebox.showerror("Error", "Invalid quantum value!")
+            return
+        cores = self.get_cores()
+        if cores is None:
+            return
+        stealing = self.stealing.get()
+
+        # Run every algorithm in parallel worker processes
+        table = self.get_table()
+        self.start_job(lambda progress: scheduler.compare(table, quantum=quantum, cores=cores,
+                                                          stealing=stealing, progress=progress),
+                       lambda metrics: self.show_comparison(metrics, quantum))
+
+    def show_comparison(self, metrics, quantum):
+        load_plotting()
+        self.clear_results()
+        results_text = "ALGORITHM COMPARISON\n" + "="*50 + "\n"
         results_text += tabulate(
             [
-                [t['id'], t['arrival'], t['burst'], t['priority'],
-                 t['start'], t['finish'], t['turnaround'],
-                 t['waiting'], t['response']] for t in tasks
+                [LABELS[name], m['avg_waiting'], m['avg_turnaround'],
+                 m['avg_response'], m['throughput']] for name, m in metrics.items()
             ],
-            headers=['ID', 'Arrival', 'Burst', 'Priority', 'Start', 'Finish', 
-                    'Turnaround', 'Waiting', 'Response'],
-            tablefmt='grid'
+            headers=['Algorithm', 'Avg Waiting', 'Avg Turnaround', 'Avg Response', 'Throughput'],
+            tablefmt='grid',
+            floatfmt='.2f'
         )
-        
-        results_text += "\n\nPERFORMANCE METRICS\n" + "="*50 + "\n"
-        results_text += f"Average Waiting Time: {total_waiting/n:.2f}\n"
-        results_text += f"Average Turnaround Time: {total_turnaround/n:.2f}\n"
-        results_text += f"Average Response Time: {total_response/n:.2f}\n"
-        results_text += f"Throughput: {n/completion_time:.2f} processes/unit time\n"
+        results_text += f"\n\nTime quantum for Round Robin: {quantum}\n"
+        self.results_text.insert(tk.END, results_text)
 
+    def sweep(self):
+        if not self.tasks:
+            messagebox.showerror("Error", "No tasks added!")
+            return
+
+        try:
+            quanta = scheduler.parse_range(self.sweep_range.get())
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        # Round Robin over a quantum range; repeated points come from the cache
+        table = self.get_table()
+        self.start_job(lambda progress: scheduler.sweep_quantum(table, quanta, progress=progress),
+                       self.show_sweep)
+
+    def show_sweep(self, results):
+        load_plotting()
+        self.clear_results()
+        results_text = "ROUND ROBIN QUANTUM SWEEP\n" + "="*50 + "\n"
+        results_text += tabulate(
+            [
+                [q, m['avg_waiting'], m['avg_turnaround'],
+                 m['avg_response'], m['throughput']] for q, m in results.items()
+            ],
+            headers=['Quantum', 'Avg Waiting', 'Avg Turnaround', 'Avg Response', 'Throughput'],
+            tablefmt='grid',
+            floatfmt='.2f'
+        )
         self.results_text.insert(tk.END, results_text)
-        
+
+        self.plot_sweep(results)
+
+    def plot_sweep(self, results):
+        load_plotting()
+        for widget in self.gantt_frame.winfo_children():
+            widget.destroy()
+        if self.current_figure is not None:
+            plt.close(self.current_figure)
+
+        fig = self.current_figure = plt.figure(figsize=(10, 3))
+        ax = fig.add_subplot(111)
+        quanta = list(results)
+        for key, label in (('avg_waiting', 'Waiting'), ('avg_turnaround', 'Turnaround'),
+                           ('avg_response', 'Response')):
+            ax.plot(quanta, [results[q][key] for q in quanta], marker='o', markersize=3, label=label)
+
+        ax.set_xlabel('Time Quantum')
+        ax.set_ylabel('Average Time')
+        ax.set_title('Round Robin Quantum Sweep')
+        ax.legend(loc='upper right', fontsize=8)
+
+        canvas = FigureCanvasTkAgg(fig, master=self.gantt_frame)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+    def start_job(self, work, on_done, error_title="Simulation Error"):
+        # work(progress) runs on a worker thread and its result is handed to
+        # on_done back on the Tk thread. Once Cancel is pressed the engine, or
+        # the worker processes, stop at their next progress callback; the
+        # buttons stay disabled until the job has actually ended.
+        job = {'cancel': threading.Event(), 'progress': None, 'result': queue.Queue()}
+
+        def progress(done, total):
+            if job['cancel'].is_set():
+                raise scheduler.Cancelled()
+            job['progress'] = done / total if total else 1.0
+
+        def worker():
+            try:
+                job['result'].put((True, work(progress)))
+            except Exception as e:
+                job['result'].put((False, e))
+
+        self.job = job
+        self.set_busy(True)
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(self.POLL_MS, self.poll_job, job, on_done, error_title)
+
+    def poll_job(self, job, on_done, error_title):
+        if job is not self.job:
+            return
+
+        try:
+            ok, value = job['result'].get_nowait()
+        except queue.Empty:
+            if job['progress'] is not None:
+                if str(self.progress_bar['mode']) == 'indeterminate':
+                    self.progress_bar.stop()
+                    self.progress_bar.configure(mode='determinate')
+                self.progress_bar['value'] = job['progress'] * 100
+            self.root.after(self.POLL_MS, self.poll_job, job, on_done, error_title)
+            return
+
+        self.job = None
+        self.set_busy(False)
+        if job['cancel'].is_set():
+            self.clear_results()
+            self.results_text.insert(tk.END, "Simulation cancelled.\n")
+        elif ok:
+            on_done(value)
+        else:
+            messagebox.showerror(error_title, str(value))
+
+    def cancel_job(self):
+        if self.job is None or self.job['cancel'].is_set():
+            return
+        self.job['cancel'].set()
+        self.cancel_btn.state(['disabled'])
+        self.clear_results()
+        self.results_text.insert(tk.END, "Cancelling...\n")
+
+    def set_busy(self, busy):
+        state = 'disabled' if busy else '!disabled'
+        for button in (self.add_btn, self.import_btn, self.open_btn, self.save_btn,
+                       self.simulate_btn, self.compare_btn, self.sweep_btn):
+            button.state([state])
+        if busy:
+            self.cancel_btn.state(['!disabled'])
+            self.progress_bar.configure(mode='indeterminate', value=0)
+            self.progress_bar.start()
+            self.cancel_btn.pack(side=tk.RIGHT, padx=5)
+            self.progress_bar.pack(side=tk.RIGHT, padx=5)
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.pack_forget()
+            self.cancel_btn.pack_forget()
+
+    def get_cache(self):
+        # Set CPU_SCHEDULER_CACHE to a directory to keep results across sessions;
+        # CPU_SCHEDULER_CACHE_MAX_BYTES and CPU_SCHEDULER_CACHE_DISK_BYTES bound
+        # the memory and disk it may use
+        if self.cache is None:
+            self.cache = scheduler.ResultCache(
+                int(os.environ.get('CPU_SCHEDULER_CACHE_MAX_BYTES', 256 * 2**20)),
+                os.environ.get('CPU_SCHEDULER_CACHE'),
+                int(os.environ.get('CPU_SCHEDULER_CACHE_DISK_BYTES', 2**30)))
+        return self.cache
+
+    def get_table(self):
+        # Columnar copy of the task list, rebuilt only after tasks change
+        if self.table is None:
+            self.table = scheduler.TaskTable.from_rows(self.tasks)
+        return self.table
+
+    def get_cores(self):
+        try:
+            cores = int(self.cores.get())
+        except ValueError:
+            cores = 0
+        if cores < 1:
+            messagebox.showerror("Error", "Invalid number of cores!")
+            return None
+        return cores
+
+    def clear_results(self):
+        self.results_text.delete(1.0, tk.END)
+        self.result_list.show(())
+        self.result = None
+
+    def display_results(self, schedule, algorithm='', quantum=0, details=None):
+        # Clear previous results
+        self.clear_results()
+        if not len(schedule.table):
+            messagebox.showerror("Error", "No results to display!")
+            return
+        self.result = (schedule, algorithm, quantum)
+
+        # Calculate metrics
+        if details is None:
+            with phase(self.profiler, 'metrics'):
+                details = scheduler.describe(schedule)
+        with phase(self.profiler, 'display'):
+            self.show_summary(schedule, algorithm, quantum, details)
+
         # Update Gantt chart
-        self.update_gantt_chart(gantt)
+        with phase(self.profiler, 'gantt'):
+            self.update_gantt_chart(schedule.gantt, schedule.table.id)
+        if self.profiler is not None:
+            self.profiler.count(algorithm or 'schedule', schedule)
+            self.show_diagnostics(self.profiler)
+            self.profiler = None
+
+    def show_summary(self, schedule, algorithm, quantum, details):
+        # Summary; per-task rows go to the paged table below it
+        title = LABELS.get(algorithm, "Scheduling Results")
+        if algorithm == 'round_robin':
+            title += f", quantum {quantum}"
+        gantt = schedule.gantt
+        if gantt.cores > 1:
+            title += f", {gantt.cores} cores"
+        results_text = f"{title}\n" + "="*50 + "\n"
+        results_text += (f"Tasks: {details['completed']}   Makespan: {details['end']}   "
+                         f"CPU utilization: {details['utilization']:.1%}   "
+                         f"Context switches: {details['context_switches']}\n")
+        if gantt.cores > 1:
+            shares = scheduler.core_utilization(gantt, 0, details['end'])
+            results_text += "Per core: " + "   ".join(
+                f"CPU {core} {share:.1%}" for core, share in enumerate(shares)) + "\n"
+        results_text += "\n"
+        results_text += f"{'':<12}" + ''.join(f"{stat:>12}" for stat in self.STATS) + "\n"
+        for name in ('waiting', 'turnaround', 'response'):
+            results_text += f"{name.capitalize():<12}" + ''.join(
+                f"{details[f'{stat.lower()}_{name}']:>12.2f}" for stat in self.STATS) + "\n"
+        results_text += f"\nThroughput: {details['throughput']:.4f} processes/unit time\n"
+
+        self.results_text.insert(tk.END, results_text)
+        self.result_list.show(ResultRows(schedule))
 
-    def update_gantt_chart(self, gantt):
+    def show_diagnostics(self, profiler):
+        load_plotting()
+        # Diagnostics window, created on first use and refreshed after every run
+        if self.diagnostics_text is None or not self.diagnostics_text.winfo_exists():
+            window = tk.Toplevel(self.root)
+            window.title("Diagnostics")
+            self.diagnostics_text = tk.Text(window, width=72, height=20, wrap=tk.NONE)
+            self.diagnostics_text.pack(fill=tk.BOTH, expand=True)
+
+        report = profiler.as_dict()
+        text = "PHASES\n" + tabulate(
+            [[name, p['wall'] * 1000, p['cpu'] * 1000, p['calls']]
+             for name, p in report['phases'].items()],
+            headers=['Phase', 'Wall (ms)', 'CPU (ms)', 'Calls'], tablefmt='simple', floatfmt='.1f')
+        for name, counters in report['counters'].items():
+            text += f"\n\nENGINE COUNTERS ({LABELS.get(name, name)})\n" + tabulate(
+                [[counter.replace('_', ' ').capitalize(), 'n/a' if value is None else value]
+                 for counter, value in counters.items()],
+                headers=['Counter', 'Value'], tablefmt='simple')
+        self.diagnostics_text.delete(1.0, tk.END)
+        self.diagnostics_text.insert(tk.END, text)
+
+    def update_gantt_chart(self, gantt, task_ids=None):
+        load_plotting()
         # Clear previous chart
         for widget in self.gantt_frame.winfo_children():
             widget.destroy()
+        if self.current_figure is not None:
+            plt.close(self.current_figure)
+            self.current_figure = None
 
         if not gantt:
             empty_label = ttk.Label(self.gantt_frame, text="No Gantt chart available")
             empty_label.pack(expand=True)
             return
 
-        # Create new figure
-        fig = plt.figure(figsize=(10, 3))
-        ax = fig.add_subplot(111)
-
-        # Create color mapping
-        unique_tasks = list({entry['task'] for entry in gantt})
-        colors = plt.cm.tab10(np.linspace(0, 1, len(unique_tasks)))
-        color_map = {task: colors[i] for i, task in enumerate(unique_tasks)}
-
-        # Plot Gantt chart
-        for i, entry in enumerate(gantt):
-            start = entry['start']
-            duration = entry['end'] - entry['start']
-            ax.broken_barh([(start, duration)], (0.1, 0.8),
-                          facecolors=color_map[entry['task']],
-                          edgecolor='black',
-                          linewidth=0.5)
-            
-            # Add task label
-            ax.text(start + duration/2, 0.5, f"P{entry['task']}",
-                   ha='center', va='center', color='white', fontsize=8)
-            
-            # Add time markers
-            if i == 0:
-                ax.text(start, -0.2, str(start), ha='left', va='top', fontsize=8)
-            ax.text(entry['end'], -0.2, str(entry['end']), ha='right', va='top', fontsize=8)
-
-        # Format chart
-        ax.set_yticks([])
-        ax.set_xlabel('Time Units')
-        ax.set_title('Gantt Chart')
-        ax.grid(True, axis='x', linestyle='--', alpha=0.7)
-        
-        # Set axis limits
-        max_time = gantt[-1]['end']
-        ax.set_xlim(0, max_time * 1.05)
-        ax.set_ylim(0, 1)
-        
-        # Add legend
-        legend_handles = [plt.Rectangle((0,0),1,1, fc=color_map[task]) 
-                        for task in unique_tasks]
-        ax.legend(legend_handles, [f'P{task}' for task in unique_tasks],
-                 loc='upper right', fontsize=8)
-
-        # Embed in Tkinter
-        canvas = FigureCanvasTkAgg(fig, master=self.gantt_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        chart = GanttChart(self.gantt_frame, gantt, task_ids)
+        self.current_figure = chart.fig
 
 if __name__ == "__main__":
     root = tk.Tk()
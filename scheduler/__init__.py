@@ -0,0 +1,44 @@
+"""Headless CPU scheduling core, usable without Tkinter or matplotlib.
+
+Names are imported from their submodules on first access, so importing the
+package (or only LABELS) does not load numpy or the engines.
+"""
+from importlib import import_module
+
+_EXPORTS = {
+    'algorithms': ('ENGINES', 'EVENTS', 'FINISH', 'SEGMENT', 'Cancelled', 'Checkpoints', 'fcfs',
+                   'non_preemptive', 'preemptive', 'priority_non_preemptive',
+                   'priority_preemptive', 'round_robin', 'run', 'serve', 'sjf', 'srtf',
+                   'stream'),
+    'cache': ('ResultCache',),
+    'gantt': ('SegmentBuilder', 'Segments'),
+    'generators': ('generate',),
+    'incremental': ('IncrementalRunner',),
+    'labels': ('LABELS',),
+    'metrics': ('core_utilization', 'describe', 'sliding_windows', 'summarize', 'utilization'),
+    'multicore': ('POLICIES', 'smp'),
+    'parallel': ('compare', 'parse_range', 'sweep_quantum'),
+    'profiling': ('Profiler', 'profile_call'),
+    'queues': ('FifoQueue', 'HeapQueue'),
+    'sinks': ('CsvSink', 'RunningMetrics', 'drain'),
+    'storage': ('ScheduleWriter', 'read_header', 'read_schedule', 'write_schedule'),
+    'table': ('Schedule', 'TaskTable'),
+    'trace': ('load_trace', 'read_events', 'reconstruct', 'replay', 'trace_format'),
+    'vectorized': ('batch_metrics', 'fcfs_batch', 'serve_in_order'),
+    'workload': ('iter_chunks', 'load_workload', 'read_tasks', 'write_workload'),
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_MODULES)
+
+
+def __getattr__(name):
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f'.{_MODULES[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULES))
@@ -0,0 +1,197 @@
+import argparse
+import os
+import sys
+
+from .algorithms import ENGINES, stream
+from .cache import ResultCache
+from .metrics import core_utilization, describe, sliding_windows, summarize, utilization
+from .parallel import compare, parse_range, sweep_quantum
+from .profiling import Profiler, phase, profile_call
+from .report import DETAIL_FIELDS, METRIC_FIELDS, write_metrics, write_results, write_windows
+from .sinks import CsvSink, RunningMetrics, drain
+from .storage import ScheduleWriter, read_header, read_schedule
+from .workload import load_workload
+
+
+# Tail latency columns printed after the averages
+TAIL_FIELDS = ('p95_waiting', 'p99_waiting', 'p99_turnaround', 'p99_response', 'utilization',
+               'context_switches')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m scheduler',
+                                     description="Run CPU scheduling algorithms on a workload file.")
+    parser.add_argument('workload', help="CSV or JSON file with id, arrival, burst and priority, "
+                                         "or a .sched file to report on")
+    parser.add_argument('-a', '--algorithm', action='append', choices=list(ENGINES),
+                        help="algorithm to run (repeatable, default: all)")
+    parser.add_argument('-q', '--quantum', type=int, default=2, help="Round Robin time quantum")
+    parser.add_argument('--cores', type=int, default=1, help="number of simulated CPUs")
+    parser.add_argument('--stealing', action='store_true',
+                        help="with --cores, per-core run queues with work stealing instead of "
+                             "one shared queue")
+    parser.add_argument('-o', '--output', default='results', help="output directory")
+    parser.add_argument('--format', choices=('csv', 'json', 'bin'), default='csv',
+                        help="bin writes one .sched schedule file per algorithm")
+    parser.add_argument('--stream', action='store_true',
+                        help="write results while the engines run, in constant memory")
+    parser.add_argument('--compare', action='store_true',
+                        help="run the algorithms in parallel and write metrics only")
+    parser.add_argument('--sweep', metavar='START:STOP[:STEP]',
+                        help="run Round Robin over a range of quanta and write sweep metrics")
+    parser.add_argument('--cache-dir', help="reuse and store schedules in this directory")
+    parser.add_argument('--cache-max-bytes', type=int, default=256 * 2**20,
+                        help="memory budget of the schedule cache")
+    parser.add_argument('--cache-disk-bytes', type=int, default=2**30,
+                        help="size limit of --cache-dir; least recently used files are deleted")
+    parser.add_argument('-j', '--jobs', type=int, help="worker processes for --compare and --sweep")
+    parser.add_argument('--window', metavar='START:END',
+                        help="with a .sched file, CPU utilization over this time window")
+    parser.add_argument('--windows', metavar='WIDTH[:STEP]',
+                        help="also write metrics over sliding time windows per algorithm")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="write wall/CPU time per phase and engine counters as JSON")
+    parser.add_argument('--cprofile', metavar='FILE',
+                        help="capture cProfile stats of the run of a single algorithm")
+    args = parser.parse_args(argv)
+    if args.stream and args.format == 'json':
+        parser.error("--stream writes csv or bin")
+    if args.cores < 1:
+        parser.error("Number of cores must be positive!")
+    if args.cores > 1 and (args.stream or args.sweep):
+        parser.error("--cores does not apply to --stream or --sweep")
+    try:
+        windows = args.windows and [int(part) for part in args.windows.split(':', 1)]
+    except ValueError:
+        parser.error(f"Invalid window: {args.windows}")
+    if args.workload.endswith('.sched'):
+        return report(parser, args, windows)
+
+    names = args.algorithm or list(ENGINES)
+    if args.cprofile and (len(names) != 1 or args.sweep or args.compare):
+        parser.error("--cprofile profiles one run; pick a single algorithm with -a")
+    profiler = Profiler() if args.profile else None
+    try:
+        with phase(profiler, 'load'):
+            table = load_workload(args.workload)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if not len(table):
+        parser.error("No tasks in workload!")
+
+    def simulate(name, func, *call_args):
+        # One engine run, timed per algorithm and optionally under cProfile
+        with phase(profiler, f'simulate:{name}'):
+            if args.cprofile:
+                return profile_call(args.cprofile, func, *call_args)
+            return func(*call_args)
+
+    key = 'algorithm'
+    details = None
+    try:
+        if args.sweep:
+            with phase(profiler, 'sweep'):
+                metrics = sweep_quantum(table, parse_range(args.sweep), args.jobs)
+            key = 'quantum'
+            write_metrics(args.output, metrics, args.format, 'sweep', key)
+        elif args.compare:
+            with phase(profiler, 'compare'):
+                metrics = compare(table, names, args.quantum, args.jobs, args.cores,
+                                  args.stealing)
+            write_metrics(args.output, metrics, args.format)
+        elif args.stream:
+            os.makedirs(args.output, exist_ok=True)
+            metrics = {}
+            for name in names:
+                running = RunningMetrics(table)
+                if args.format == 'bin':
+                    sink = ScheduleWriter(os.path.join(args.output, f'{name}.sched'), table, name,
+                                          args.quantum if name == 'round_robin' else 0)
+                else:
+                    sink = CsvSink(args.output, table, name)
+                sinks = [sink, running]
+                if profiler is not None:
+                    sinks.append(profiler.sink(name))
+                counters = None if profiler is None else profiler.engine(name)
+                simulate(name, drain, stream(name, table, args.quantum, None, counters), *sinks)
+                metrics[name] = running.summary()
+            write_metrics(args.output, metrics)
+        else:
+            cache = ResultCache(args.cache_max_bytes, args.cache_dir, args.cache_disk_bytes)
+            results = {}
+            for name in names:
+                counters = None if profiler is None else profiler.engine(name)
+                results[name] = simulate(name, cache.run, name, table, args.quantum, None,
+                                         args.cores, args.stealing, counters)
+                if profiler is not None:
+                    profiler.count(name, results[name])
+            with phase(profiler, 'metrics'):
+                metrics = {name: summarize(schedule) for name, schedule in results.items()}
+                details = {name: describe(schedule) for name, schedule in results.items()}
+            with phase(profiler, 'write'):
+                write_results(args.output, results, metrics, args.format, args.quantum)
+                write_metrics(args.output, details, args.format, 'details', fields=DETAIL_FIELDS)
+                for name, schedule in results.items():
+                    if windows:
+                        write_windows(args.output, name, sliding_windows(schedule, *windows),
+                                      args.format)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print_metrics(metrics, key)
+    if details:
+        print()
+        print_metrics(details, key, TAIL_FIELDS)
+    if details and args.cores > 1:
+        print()
+        for name, schedule in results.items():
+            print_cores(name, schedule)
+    if profiler is not None:
+        profiler.write(args.profile)
+    return 0
+
+
+def report(parser, args, windows=None):
+    # Metrics of a saved schedule; the Gantt segments are only read inside the window
+    try:
+        header = read_header(args.workload)
+        schedule = read_schedule(args.workload)
+        t0, t1 = 0, int(schedule.finish.max(initial=0))
+        if args.window:
+            t0, t1 = (int(value) for value in args.window.split(':'))
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    name = header['algorithm'] or 'schedule'
+    print_metrics({name: summarize(schedule)})
+    print()
+    print_metrics({name: describe(schedule)}, fields=TAIL_FIELDS)
+    print(f"{header['tasks']} tasks, {header['segments']} segments, "
+          f"CPU utilization {utilization(schedule.gantt, t0, t1):.1%} over [{t0}, {t1}]")
+    if header['cores'] > 1:
+        print_cores(name, schedule, t0, t1)
+    if windows:
+        try:
+            write_windows(args.output, name, sliding_windows(schedule, *windows), args.format)
+        except ValueError as e:
+            parser.error(str(e))
+    return 0
+
+
+def print_metrics(metrics, key='algorithm', fields=METRIC_FIELDS):
+    print(f"{key:<25}" + ''.join(f"{field:>18}" for field in fields))
+    for name, m in metrics.items():
+        print(f"{name:<25}" + ''.join(f"{m[field]:>18.2f}" for field in fields))
+
+
+
+def print_cores(name, schedule, t0=0, t1=None):
+    # Per-core utilization of a multi-core run
+    if t1 is None:
+        t1 = int(schedule.finish.max(initial=0))
+    shares = core_utilization(schedule.gantt, t0, t1)
+    print(f"{name:<25}" + ' '.join(f"CPU {core} {share:.1%}" for core, share in enumerate(shares)))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
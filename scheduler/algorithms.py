@@ -0,0 +1,454 @@
+import numpy as np
+
+from .gantt import SegmentBuilder, Segments
+from .profiling import measured
+from .queues import FifoQueue, HeapQueue
+from .table import Schedule
+from .vectorized import serve_in_order
+
+# Engines call progress(done, total) every PROGRESS_INTERVAL scheduling events
+PROGRESS_INTERVAL = 1024
+
+# Target number of checkpoints an engine keeps when asked to record them, and
+# the bytes their snapshots may take together
+CHECKPOINTS = 16
+CHECKPOINT_BYTES = 32 * 2**20
+
+
+# Engine events: (SEGMENT, task, start, end) when a task holds the CPU and
+# (FINISH, task, start, finish) when it completes; task is a TaskTable row
+SEGMENT = 'segment'
+FINISH = 'finish'
+
+
+class Cancelled(Exception):
+    # Raised from a progress callback to stop a run cooperatively
+    pass
+
+
+class Checkpoints:
+    # Engine state snapshots taken at event boundaries. Each snapshot holds the
+    # clock, the arrival cursor, the ready queue as int64 arrays and, for the
+    # engines that preempt, the start and remaining time of the queued tasks
+    # and then the running one in queue order; finished tasks are read back
+    # from the run's final Schedule. Every other snapshot is dropped and the
+    # spacing doubled whenever more than 2 * CHECKPOINTS pile up or together
+    # they outgrow max_bytes.
+    def __init__(self, n, kept=(), max_bytes=CHECKPOINT_BYTES):
+        self.interval = max(1, n // CHECKPOINTS)
+        self.max_bytes = max_bytes
+        self.items = list(kept)
+        self.nbytes = sum(state['nbytes'] for state in self.items)
+
+    def add(self, state):
+        state['nbytes'] = sum(value.nbytes for value in state['queue'] + state['active']
+                              if isinstance(value, np.ndarray))
+        self.items.append(state)
+        self.nbytes += state['nbytes']
+        while self.items and (len(self.items) > 2 * CHECKPOINTS or self.nbytes > self.max_bytes):
+            del self.items[::2]
+            self.nbytes = sum(state['nbytes'] for state in self.items)
+            self.interval *= 2
+
+
+def _restore(table, resume):
+    # Start, finish and remaining time of every task, and the Gantt prefix, as
+    # they stood at a checkpoint of an earlier run (base) on a workload that is
+    # unchanged up to the checkpoint time
+    checkpoint, base = resume
+    arrived = table.order[:checkpoint['i']]
+    start = np.full(len(table), -1, dtype=np.int64)
+    finish = np.full(len(table), -1, dtype=np.int64)
+    remaining = table.burst.copy()
+    start[arrived] = base.start[arrived]
+    finish[arrived] = base.finish[arrived]
+    remaining[arrived] = 0
+
+    # Queued and running tasks; without start and remaining columns they have
+    # not run yet
+    active = checkpoint['queue'][0]
+    if checkpoint.get('running') is not None:
+        active = np.append(active, checkpoint['running'])
+    finish[active] = -1
+    if checkpoint['active']:
+        start[active], remaining[active] = checkpoint['active']
+    else:
+        start[active] = -1
+        remaining[active] = table.burst[active]
+    return start.tolist(), finish.tolist(), remaining.tolist(), base.gantt[:checkpoint['segments']]
+
+
+def _active(start, remaining, tasks):
+    # Start and remaining time of the given tasks for a checkpoint
+    return np.array(start, dtype=np.int64)[tasks], np.array(remaining, dtype=np.int64)[tasks]
+
+
+def _collect(table, events, resume=None):
+    # Folds an engine's event stream into a Schedule
+    ids = table.id.tolist()
+    if resume is None:
+        start = [-1] * len(table)
+        finish = [-1] * len(table)
+        gantt = SegmentBuilder()
+    else:
+        start, finish, _, prefix = _restore(table, resume)
+        gantt = SegmentBuilder(prefix)
+    add_task, add_start, add_end = gantt.task.append, gantt.start.append, gantt.end.append
+
+    for kind, task, event_start, event_end in events:
+        if kind is SEGMENT:
+            add_task(ids[task])
+            add_start(event_start)
+            add_end(event_end)
+        else:
+            start[task] = event_start
+            finish[task] = event_end
+
+    start = np.array(start, dtype=np.int64)
+    return Schedule(table, start, finish, start - table.arrival, gantt.build())
+
+
+def fcfs(table, progress=None, checkpoints=None, resume=None, counters=None):
+    # Closed form, so there is nothing to checkpoint or count; always recomputed
+    return serve(table, table.order, progress)
+
+
+def fcfs_events(table, progress=None, checkpoints=None, resume=None, counters=None):
+    return serve_events(table, table.order, progress)
+
+
+def serve(table, order, progress=None):
+    # Closed form for a fixed service order: no task arriving later can jump
+    # ahead, so start and finish follow from cumulative bursts alone
+    if progress is not None:
+        progress(0, len(table))
+    order = np.asarray(order)
+    arrival = table.arrival[order]
+    start_sorted, finish_sorted = serve_in_order(arrival, table.burst[order])
+    start = np.empty(len(table), dtype=np.int64)
+    finish = np.empty(len(table), dtype=np.int64)
+    start[order] = start_sorted
+    finish[order] = finish_sorted
+
+    gantt = Segments(table.id[order], start_sorted, finish_sorted)
+    return Schedule(table, start, finish, start - table.arrival, gantt)
+
+
+def serve_events(table, order, progress=None):
+    # Events of serve(), converted to Python ints one block at a time
+    n = len(table)
+    order = np.asarray(order)
+    start, finish = serve_in_order(table.arrival[order], table.burst[order])
+    for lo in range(0, n, PROGRESS_INTERVAL):
+        if progress is not None:
+            progress(lo, n)
+        hi = lo + PROGRESS_INTERVAL
+        for task, task_start, task_finish in zip(order[lo:hi].tolist(), start[lo:hi].tolist(),
+                                                 finish[lo:hi].tolist()):
+            yield SEGMENT, task, task_start, task_finish
+            yield FINISH, task, task_start, task_finish
+
+
+def sjf(table, progress=None, checkpoints=None, resume=None, counters=None):
+    if _all_arrive_together(table):
+        return serve(table, _sorted_by(table, table.burst), progress)
+    return _collect(table, sjf_events(table, progress, checkpoints, resume, counters), resume)
+
+
+def sjf_events(table, progress=None, checkpoints=None, resume=None, counters=None):
+    if _all_arrive_together(table):
+        return serve_events(table, _sorted_by(table, table.burst), progress)
+    return non_preemptive_events(table, HeapQueue(table.burst.tolist().__getitem__), progress,
+                                 checkpoints, resume, counters)
+
+
+def priority_non_preemptive(table, progress=None, checkpoints=None, resume=None, counters=None):
+    if _all_arrive_together(table):
+        return serve(table, _sorted_by(table, table.priority), progress)
+    return _collect(table, priority_non_preemptive_events(table, progress, checkpoints, resume,
+                                                          counters), resume)
+
+
+def priority_non_preemptive_events(table, progress=None, checkpoints=None, resume=None,
+                                   counters=None):
+    if _all_arrive_together(table):
+        return serve_events(table, _sorted_by(table, table.priority), progress)
+    return non_preemptive_events(table, HeapQueue(table.priority.tolist().__getitem__), progress,
+                                 checkpoints, resume, counters)
+
+
+def _all_arrive_together(table):
+    # Then the whole ready set is known up front and the dispatch order is a sort
+    return len(table) > 0 and table.arrival.min() == table.arrival.max()
+
+
+def _sorted_by(table, key):
+    return table.order[np.argsort(key[table.order], kind='stable')]
+
+
+def non_preemptive(table, ready_queue, progress=None, checkpoints=None, resume=None, counters=None):
+    return _collect(table, non_preemptive_events(table, ready_queue, progress, checkpoints, resume,
+                                                 counters), resume)
+
+
+def non_preemptive_events(table, ready_queue, progress=None, checkpoints=None, resume=None,
+                          counters=None):
+    arrival = table.arrival.tolist()
+    burst = table.burst.tolist()
+    order = table.order.tolist()
+    n = len(table)
+    if resume is None:
+        current_time = 0
+        i = 0
+        done = 0
+        events = 0
+        segments = 0
+    else:
+        state = resume[0]
+        current_time, i, done = state['time'], state['i'], state['done']
+        events, segments = state['events'], state['segments']
+        ready_queue.restore(state['queue'])
+
+    while i < n or ready_queue:
+        events += 1
+        if checkpoints is not None and not events % checkpoints.interval:
+            checkpoints.add({
+                'time': current_time, 'i': i, 'done': done, 'events': events - 1,
+                'segments': segments, 'queue': ready_queue.snapshot(), 'active': (),
+            })
+
+        while i < n and arrival[order[i]] <= current_time:
+            ready_queue.push(order[i])
+            i += 1
+
+        if not ready_queue:
+            current_time = arrival[order[i]]
+            continue
+
+        task = ready_queue.pop()
+        done += 1
+        if progress is not None and not done % PROGRESS_INTERVAL:
+            progress(done, n)
+
+        finish_time = current_time + burst[task]
+        yield SEGMENT, task, current_time, finish_time
+        yield FINISH, task, current_time, finish_time
+        segments += 1
+        current_time = finish_time
+    measured(counters, events, [ready_queue])
+
+
+def priority_preemptive(table, progress=None, checkpoints=None, resume=None, counters=None):
+    return preemptive(table, 'priority', progress, checkpoints, resume, counters)
+
+
+def priority_preemptive_events(table, progress=None, checkpoints=None, resume=None, counters=None):
+    return preemptive_events(table, 'priority', progress, checkpoints, resume, counters)
+
+
+def round_robin(table, quantum, progress=None, checkpoints=None, resume=None, counters=None):
+    return _collect(table, round_robin_events(table, quantum, progress, checkpoints, resume,
+                                              counters), resume)
+
+
+def round_robin_events(table, quantum, progress=None, checkpoints=None, resume=None, counters=None):
+    arrival = table.arrival.tolist()
+    order = table.order.tolist()
+    n = len(table)
+    ready_queue = FifoQueue()
+    if resume is None:
+        start = [-1] * n
+        remaining = table.burst.tolist()
+        current_time = 0
+        i = 0
+        done = 0
+        events = 0
+        segments = 0
+    else:
+        start, _, remaining, _ = _restore(table, resume)
+        state = resume[0]
+        current_time, i, done = state['time'], state['i'], state['done']
+        events, segments = state['events'], state['segments']
+        ready_queue.restore(state['queue'])
+
+    while i < n or ready_queue:
+        events += 1
+        if progress is not None and not events % PROGRESS_INTERVAL:
+            progress(done, n)
+        if checkpoints is not None and not events % checkpoints.interval:
+            queue = ready_queue.snapshot()
+            checkpoints.add({
+                'time': current_time, 'i': i, 'done': done, 'events': events - 1,
+                'segments': segments, 'queue': queue,
+                'active': _active(start, remaining, queue[0]),
+            })
+
+        while i < n and arrival[order[i]] <= current_time:
+            ready_queue.push(order[i])
+            i += 1
+
+        if not ready_queue:
+            current_time = arrival[order[i]]
+            continue
+
+        task = ready_queue.pop()
+
+        if start[task] == -1:
+            start[task] = current_time
+
+        exec_time = min(quantum, remaining[task])
+        yield SEGMENT, task, current_time, current_time + exec_time
+        segments += 1
+
+        current_time += exec_time
+        remaining[task] -= exec_time
+
+        while i < n and arrival[order[i]] <= current_time:
+            ready_queue.push(order[i])
+            i += 1
+
+        if remaining[task] > 0:
+            ready_queue.push(task)
+        else:
+            yield FINISH, task, start[task], current_time
+            done += 1
+    measured(counters, events, [ready_queue])
+
+
+def srtf(table, progress=None, checkpoints=None, resume=None, counters=None):
+    return preemptive(table, 'remaining', progress, checkpoints, resume, counters)
+
+
+def srtf_events(table, progress=None, checkpoints=None, resume=None, counters=None):
+    return preemptive_events(table, 'remaining', progress, checkpoints, resume, counters)
+
+
+def preemptive(table, key, progress=None, checkpoints=None, resume=None, counters=None):
+    return _collect(table, preemptive_events(table, key, progress, checkpoints, resume, counters),
+                    resume)
+
+
+def preemptive_events(table, key, progress=None, checkpoints=None, resume=None, counters=None):
+    # Event-driven: time jumps to the next arrival or completion instead of
+    # ticking one unit at a time. The running task is only preempted by a
+    # strictly lower rank, where rank is its remaining time or priority.
+    arrival = table.arrival.tolist()
+    order = table.order.tolist()
+    n = len(table)
+    if resume is None:
+        start = [-1] * n
+        remaining = table.burst.tolist()
+        current_time = 0
+        i = 0
+        done = 0
+        events = 0
+        segments = 0
+        running = None
+        segment_start = 0
+    else:
+        start, _, remaining, _ = _restore(table, resume)
+        state = resume[0]
+        current_time, i, done = state['time'], state['i'], state['done']
+        events, segments = state['events'], state['segments']
+        running, segment_start = state['running'], state['segment_start']
+    rank = (remaining if key == 'remaining' else getattr(table, key).tolist()).__getitem__
+    ready_queue = HeapQueue(rank)
+    if resume is not None:
+        ready_queue.restore(resume[0]['queue'])
+
+    while i < n or ready_queue or running is not None:
+        events += 1
+        if progress is not None and not events % PROGRESS_INTERVAL:
+            progress(done, n)
+        if checkpoints is not None and not events % checkpoints.interval:
+            queue = ready_queue.snapshot()
+            active = queue[0] if running is None else np.append(queue[0], running)
+            checkpoints.add({
+                'time': current_time, 'i': i, 'done': done, 'events': events - 1,
+                'segments': segments, 'queue': queue,
+                'running': running, 'segment_start': segment_start,
+                'active': _active(start, remaining, active),
+            })
+
+        if running is None:
+            if not ready_queue:
+                current_time = arrival[order[i]]
+            while i < n and arrival[order[i]] <= current_time:
+                ready_queue.push(order[i])
+                i += 1
+
+            running = ready_queue.pop()
+            segment_start = current_time
+            if start[running] == -1:
+                start[running] = current_time
+            continue
+
+        finish_time = current_time + remaining[running]
+        if i < n and arrival[order[i]] < finish_time:
+            next_time = arrival[order[i]]
+            remaining[running] -= next_time - current_time
+            current_time = next_time
+            while i < n and arrival[order[i]] <= current_time:
+                ready_queue.push(order[i])
+                i += 1
+
+            if ready_queue.peek_key() < rank(running):
+                yield SEGMENT, running, segment_start, current_time
+                segments += 1
+                ready_queue.push_front(running)
+                running = ready_queue.pop()
+                segment_start = current_time
+                if start[running] == -1:
+                    start[running] = current_time
+            continue
+
+        current_time = finish_time
+        remaining[running] = 0
+        yield SEGMENT, running, segment_start, current_time
+        yield FINISH, running, start[running], current_time
+        segments += 1
+        running = None
+        done += 1
+    measured(counters, events, [ready_queue])
+
+ENGINES = {
+    'fcfs': fcfs,
+    'sjf': sjf,
+    'priority_non_preemptive': priority_non_preemptive,
+    'priority_preemptive': priority_preemptive,
+    'round_robin': round_robin,
+    'srtf': srtf,
+}
+
+EVENTS = {
+    'fcfs': fcfs_events,
+    'sjf': sjf_events,
+    'priority_non_preemptive': priority_non_preemptive_events,
+    'priority_preemptive': priority_preemptive_events,
+    'round_robin': round_robin_events,
+    'srtf': srtf_events,
+}
+
+
+def _check(algorithm, quantum):
+    if algorithm not in ENGINES:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if algorithm == 'round_robin' and quantum <= 0:
+        raise ValueError("Time quantum must be positive!")
+
+
+def run(algorithm, table, quantum=0, progress=None, counters=None):
+    # counters: optional dict the engine fills in, see profiling.MEASURED
+    _check(algorithm, quantum)
+    if algorithm == 'round_robin':
+        return round_robin(table, quantum, progress, counters=counters)
+    return ENGINES[algorithm](table, progress, counters=counters)
+
+
+def stream(algorithm, table, quantum=0, progress=None, counters=None):
+    # Lazy event stream of one run; see SEGMENT and FINISH. Memory stays
+    # proportional to the workload however many segments the run produces.
+    _check(algorithm, quantum)
+    if algorithm == 'round_robin':
+        return round_robin_events(table, quantum, progress, counters=counters)
+    return EVENTS[algorithm](table, progress, counters=counters)
@@ -0,0 +1,197 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from .algorithms import ENGINES, run
+from .generators import generate
+
+SIZES = tuple(10 ** k for k in range(2, 8))
+QUANTUM = 4
+
+# Runs shorter than MIN_TIME are repeated (up to REPEAT times) and the best kept
+MIN_TIME = 1.0
+REPEAT = 5
+
+# A case regresses when it is this much slower or bigger than the baseline and
+# the difference is above the noise floor
+TOLERANCE = 1.25
+TIME_FLOOR = 0.01
+MEMORY_FLOOR = 2**20
+
+# Committed baseline for --check: small sizes that run in seconds, compared with
+# a tolerance wide enough for a different or busy machine. Regenerate it with
+# python -m scheduler.benchmark --sizes 2:4 -o scheduler/benchmark_baseline.json
+BASELINE = os.path.join(os.path.dirname(__file__), 'benchmark_baseline.json')
+CHECK_SIZES = '2:4'
+CHECK_TOLERANCE = 3.0
+
+# Seconds a fresh interpreter may spend importing each module (the GUI from the
+# repository root), and the heavy modules those imports must leave for later
+STARTUP_BUDGET = {'scheduler': 0.05, 'cpu_scheduler_gui': 0.15}
+DEFERRED = ('matplotlib', 'numpy', 'tabulate')
+
+
+def measure(algorithm, table, quantum=QUANTUM, memory=True):
+    # Best wall time of the run, then its peak traced allocation in a separate
+    # run so tracing does not distort the timing
+    best = float('inf')
+    total = 0.0
+    runs = 0
+    while runs < REPEAT and total < MIN_TIME:
+        start = time.perf_counter()
+        run(algorithm, table, quantum)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+        runs += 1
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            run(algorithm, table, quantum)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {'seconds': best, 'peak_bytes': peak}
+
+
+def benchmark(sizes=SIZES, algorithms=None, seed=0, quantum=QUANTUM, memory=True):
+    # Yields ('<algorithm>/<n>', stats) for every case, on the default
+    # generated workload of each size
+    for n in sizes:
+        table = generate(n, seed)
+        for name in algorithms or ENGINES:
+            yield f'{name}/{n}', measure(name, table, quantum, memory)
+
+
+def regressions(results, baseline, tolerance=TOLERANCE, timing=True):
+    # Human-readable descriptions of the cases that got worse; without timing
+    # only peak memory, which does not depend on the machine, is compared
+    found = []
+    for key, stats in results.items():
+        if key not in baseline:
+            continue
+        before = baseline[key]
+        if (timing and stats['seconds'] > before['seconds'] * tolerance and
+                stats['seconds'] - before['seconds'] > TIME_FLOOR):
+            found.append(f"{key}: {before['seconds']:.3f}s -> {stats['seconds']:.3f}s")
+        if (stats['peak_bytes'] is not None and before.get('peak_bytes') is not None and
+                stats['peak_bytes'] > before['peak_bytes'] * tolerance and
+                stats['peak_bytes'] - before['peak_bytes'] > MEMORY_FLOOR):
+            found.append(f"{key}: {before['peak_bytes'] / 2**20:.1f} MiB -> "
+                         f"{stats['peak_bytes'] / 2**20:.1f} MiB")
+    return found
+
+
+def startup(module, repeat=REPEAT):
+    # Best import time of module over fresh interpreters, and the DEFERRED
+    # modules the import loaded anyway
+    code = ("import sys, time\n"
+            "start = time.perf_counter()\n"
+            f"import {module}\n"
+            "print(time.perf_counter() - start)\n"
+            f"print(*[name for name in {DEFERRED!r} if name in sys.modules])\n")
+    best = float('inf')
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, universal_newlines=True, check=True)
+        seconds, loaded = result.stdout.split('\n')[:2]
+        best = min(best, float(seconds))
+    return best, loaded.split()
+
+
+def check_startup(budget=STARTUP_BUDGET):
+    # Prints the startup time of every module against its budget and returns
+    # the number of modules over budget or loading a deferred module
+    failures = 0
+    print(f"{'module':<32}{'ms':>12}{'budget ms':>12}  loaded")
+    for module, limit in budget.items():
+        try:
+            seconds, loaded = startup(module)
+        except subprocess.CalledProcessError as e:
+            print(f"{module:<32}{'skipped':>12}  {e.stderr.strip().splitlines()[-1]}")
+            continue
+        failures += seconds > limit or bool(loaded)
+        print(f"{module:<32}{seconds * 1000:>12.1f}{limit * 1000:>12.0f}  {' '.join(loaded)}")
+    return failures
+
+
+def parse_sizes(text):
+    # "100,1000" or "2:6" for 10**2 .. 10**6
+    try:
+        if ':' in text:
+            low, high = (int(part) for part in text.split(':'))
+            return [10 ** k for k in range(low, high + 1)]
+        return [int(part) for part in text.split(',')]
+    except ValueError:
+        raise ValueError(f"Invalid sizes: {text}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m scheduler.benchmark',
+                                     description="Time every algorithm on growing workloads.")
+    parser.add_argument('--sizes', default='2:7',
+                        help="task counts, comma separated or LOW:HIGH powers of ten")
+    parser.add_argument('-a', '--algorithm', action='append', choices=list(ENGINES),
+                        help="algorithm to run (repeatable, default: all)")
+    parser.add_argument('-q', '--quantum', type=int, default=QUANTUM, help="Round Robin time quantum")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="skip the peak memory runs")
+    parser.add_argument('--baseline', help="JSON results to compare against; regressions exit 1")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help="allowed slowdown or growth factor against the baseline")
+    parser.add_argument('-o', '--output', help="write the results as JSON (usable as a baseline)")
+    parser.add_argument('--check', action='store_true',
+                        help=f"run sizes {CHECK_SIZES} against the committed baseline with "
+                             f"tolerance {CHECK_TOLERANCE}; regressions exit 1")
+    parser.add_argument('--startup', action='store_true',
+                        help="only check import times against STARTUP_BUDGET; failures exit 1")
+    args = parser.parse_args(argv)
+    if args.startup:
+        return 1 if check_startup() else 0
+    if args.check:
+        args.sizes, args.baseline, args.tolerance = CHECK_SIZES, BASELINE, CHECK_TOLERANCE
+
+    try:
+        sizes = parse_sizes(args.sizes)
+        baseline = None
+        if args.baseline:
+            with open(args.baseline) as f:
+                baseline = json.load(f)['results']
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(str(e))
+
+    results = {}
+    print(f"{'case':<32}{'seconds':>12}{'peak MiB':>12}")
+    for key, stats in benchmark(sizes, args.algorithm, args.seed, args.quantum,
+                                not args.no_memory):
+        results[key] = stats
+        peak = '-' if stats['peak_bytes'] is None else f"{stats['peak_bytes'] / 2**20:.1f}"
+        print(f"{key:<32}{stats['seconds']:>12.5f}{peak:>12}", flush=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'python': platform.python_version(), 'numpy': np.__version__,
+                       'machine': platform.platform(), 'quantum': args.quantum,
+                       'seed': args.seed, 'results': results}, f, indent=2)
+
+    if baseline is not None:
+        found = regressions(results, baseline, args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            return 1
+        print("No regressions against the baseline.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
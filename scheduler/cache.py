@@ -0,0 +1,136 @@
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from .algorithms import run
+from .gantt import Segments
+from .multicore import smp
+from .table import Schedule
+
+
+def schedule_nbytes(schedule):
+    columns = (schedule.start, schedule.finish, schedule.response, schedule.remaining)
+    return sum(column.nbytes for column in columns) + schedule.gantt.nbytes
+
+
+class ResultCache:
+    # LRU of schedules keyed by (workload fingerprint, algorithm, quantum, cores,
+    # work stealing) and bounded by an approximate byte budget. With a directory, every result is
+    # also written as an .npz file so later sessions can reuse it; the directory
+    # is kept under max_disk_bytes by deleting the least recently used files,
+    # by modification time, which a cache hit refreshes.
+    def __init__(self, max_bytes=256 * 2**20, directory=None, max_disk_bytes=2**30):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(table, algorithm, quantum=0, cores=1, stealing=False):
+        return (table.fingerprint(), algorithm, quantum if algorithm == 'round_robin' else 0,
+                cores, bool(stealing) and cores > 1)
+
+    def get(self, table, algorithm, quantum=0, cores=1, stealing=False):
+        key = self.key(table, algorithm, quantum, cores, stealing)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+
+        schedule = self._load(key, table)
+        if schedule is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._remember(key, schedule)
+        return schedule
+
+    def put(self, table, algorithm, quantum, schedule, cores=1, stealing=False):
+        key = self.key(table, algorithm, quantum, cores, stealing)
+        self._remember(key, schedule)
+        if self.directory:
+            self._save(key, schedule)
+
+    def run(self, algorithm, table, quantum=0, progress=None, cores=1, stealing=False,
+            counters=None):
+        schedule = self.get(table, algorithm, quantum, cores, stealing)
+        if schedule is None:
+            if cores > 1:
+                schedule = smp(table, algorithm, cores, quantum, stealing, progress, counters)
+            else:
+                schedule = run(algorithm, table, quantum, progress, counters)
+            self.put(table, algorithm, quantum, schedule, cores, stealing)
+        return schedule
+
+    def clear(self):
+        self.entries.clear()
+        self.nbytes = 0
+
+    def _remember(self, key, schedule):
+        if key in self.entries:
+            self.nbytes -= schedule_nbytes(self.entries.pop(key))
+        size = schedule_nbytes(schedule)
+        if size > self.max_bytes:
+            return
+        self.entries[key] = schedule
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.nbytes -= schedule_nbytes(evicted)
+
+    def _path(self, key):
+        fingerprint, algorithm, quantum, cores, stealing = key
+        if cores > 1:
+            algorithm += f'-{cores}' + ('s' if stealing else '')
+        return os.path.join(self.directory, f'{fingerprint}-{algorithm}-{quantum}.npz')
+
+    def _save(self, key, schedule):
+        gantt = schedule.gantt
+        path = self._path(key)
+        lanes = {} if gantt.core is None else {'gantt_core': gantt.core}
+        with open(path + '.tmp', 'wb') as f:
+            np.savez(f, start=schedule.start, finish=schedule.finish, response=schedule.response,
+                     remaining=schedule.remaining, gantt_task=gantt.task,
+                     gantt_start=gantt.start, gantt_end=gantt.end, **lanes)
+        os.replace(path + '.tmp', path)
+        self._prune()
+
+    def _prune(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.npz'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def _load(self, key, table):
+        if not self.directory or not os.path.exists(self._path(key)):
+            return None
+        try:
+            os.utime(self._path(key))
+            with np.load(self._path(key)) as data:
+                core = data['gantt_core'] if 'gantt_core' in data.files else None
+                gantt = Segments(data['gantt_task'], data['gantt_start'], data['gantt_end'],
+                                 core, key[3])
+                return Schedule(table, data['start'], data['finish'], data['response'], gantt,
+                                data['remaining'])
+        except (OSError, KeyError, ValueError):
+            # Unreadable or stale file; recompute
+            return None
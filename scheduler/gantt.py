@@ -0,0 +1,132 @@
+from array import array
+
+import numpy as np
+
+GANTT_FIELDS = ('task', 'start', 'end')
+
+
+class Segments:
+    # Gantt chart as parallel int64 columns of task ID, start and end, in time
+    # order. The columns may be memory-mapped from a schedule file, so only the
+    # parts that are actually read get loaded. Multi-core schedules add a core
+    # column and are stored lane by lane, sorted by (core, start): each core's
+    # lane is a contiguous slice in time order, found by a binary search.
+    def __init__(self, task=(), start=(), end=(), core=None, cores=1):
+        self.task = np.asarray(task, dtype=np.int64)
+        self.start = np.asarray(start, dtype=np.int64)
+        self.end = np.asarray(end, dtype=np.int64)
+        self.core = None if core is None else np.asarray(core, dtype=np.int64)
+        self.cores = cores
+        if not len(self.task) == len(self.start) == len(self.end):
+            raise ValueError("Segment columns must have the same length!")
+        if self.core is not None and len(self.core) != len(self.task):
+            raise ValueError("Segment columns must have the same length!")
+        self._bounds = None
+
+    @classmethod
+    def from_rows(cls, rows):
+        # [{'task', 'start', 'end'}, ...]
+        rows = list(rows)
+        return cls(*(np.fromiter((row[field] for row in rows), dtype=np.int64, count=len(rows))
+                     for field in GANTT_FIELDS))
+
+    def __len__(self):
+        return len(self.task)
+
+    def __getitem__(self, index):
+        return Segments(self.task[index], self.start[index], self.end[index],
+                        None if self.core is None else self.core[index], self.cores)
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in (self.task, self.start, self.end, self.core)
+                   if column is not None)
+
+    def bounds(self):
+        # Offsets of the lanes: core c holds segments bounds[c]:bounds[c + 1]
+        if self._bounds is None:
+            if self.core is None:
+                self._bounds = [0, len(self)]
+            else:
+                self._bounds = np.searchsorted(self.core, np.arange(self.cores + 1)).tolist()
+        return self._bounds
+
+    def lane(self, core):
+        # One core's segments as a single-lane chart; a view, not a copy
+        if self.core is None:
+            return self
+        lo, hi = self.bounds()[core:core + 2]
+        return Segments(self.task[lo:hi], self.start[lo:hi], self.end[lo:hi])
+
+    def window(self, t0, t1):
+        # Segments overlapping the time window [t0, t1]; a binary search in
+        # each lane
+        if self.core is not None:
+            bounds = self.bounds()
+            parts = []
+            for lo, hi in zip(bounds[:-1], bounds[1:]):
+                first = lo + np.searchsorted(self.end[lo:hi], t0, side='right')
+                last = lo + np.searchsorted(self.start[lo:hi], t1, side='left')
+                parts.append(np.arange(first, max(first, last)))
+            return self[np.concatenate(parts)]
+        lo = np.searchsorted(self.end, t0, side='right')
+        hi = np.searchsorted(self.start, t1, side='left')
+        return self[lo:max(lo, hi)]
+
+    def rows(self):
+        if self.core is None:
+            return [dict(zip(GANTT_FIELDS, row))
+                    for row in zip(self.task.tolist(), self.start.tolist(), self.end.tolist())]
+        return [dict(zip(GANTT_FIELDS + ('core',), row))
+                for row in zip(self.task.tolist(), self.start.tolist(), self.end.tolist(),
+                               self.core.tolist())]
+
+
+class SegmentBuilder:
+    # Growable int64 buffers that segments are appended to one at a time,
+    # optionally continuing from a prefix of an earlier Segments
+    def __init__(self, prefix=None):
+        self.task = array('q')
+        self.start = array('q')
+        self.end = array('q')
+        if prefix is not None:
+            for buffer, column in zip((self.task, self.start, self.end),
+                                      (prefix.task, prefix.start, prefix.end)):
+                buffer.frombytes(np.ascontiguousarray(column).tobytes())
+
+    def build(self):
+        return Segments(*(np.frombuffer(buffer, dtype=np.int64)
+                          for buffer in (self.task, self.start, self.end)))
+
+
+def merge_adjacent(task, start, end):
+    # Join back-to-back segments of the same task into one
+    if len(task) < 2:
+        return task, start, end
+    joined = (task[1:] == task[:-1]) & (start[1:] == end[:-1])
+    first = np.concatenate(([True], ~joined))
+    last = np.concatenate((~joined, [True]))
+    return task[first], start[first], end[last]
+
+
+def visible_bars(task, start, end, t0, t1, bins):
+    # Bars to draw for the time window [t0, t1] at `bins` pixels across. Segments
+    # are returned as-is when they fit; otherwise each pixel samples the segment
+    # under its centre and runs of equal samples become one bar.
+    lo = np.searchsorted(end, t0, side='right')
+    hi = np.searchsorted(start, t1, side='left')
+    if hi - lo <= bins:
+        return task[lo:hi], start[lo:hi], end[lo:hi]
+
+    edges = np.linspace(t0, t1, bins + 1)
+    centres = (edges[:-1] + edges[1:]) / 2
+    idx = np.searchsorted(start, centres, side='right') - 1
+    covered = (idx >= 0) & (end[np.maximum(idx, 0)] > centres)
+    sample = np.where(covered, task[np.maximum(idx, 0)], 0)
+
+    change = np.ones(bins, dtype=bool)
+    change[1:] = (covered[1:] != covered[:-1]) | (sample[1:] != sample[:-1])
+    run_start = np.flatnonzero(change)
+    run_end = np.append(run_start[1:], bins)
+    keep = covered[run_start]
+    return sample[run_start[keep]], edges[run_start[keep]], edges[run_end[keep]]
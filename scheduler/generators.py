@@ -0,0 +1,98 @@
+import argparse
+import sys
+
+import numpy as np
+
+from .table import TaskTable
+from .workload import write_workload
+
+# Each distribution maps (rng, n, options) to n int64 values. Times are whole
+# units, so bursts are rounded to the nearest unit and at least 1.
+
+
+def poisson_arrivals(rng, n, rate, batch):
+    # Exponential inter-arrival gaps at `rate` tasks per time unit
+    return np.floor(np.cumsum(rng.exponential(1 / rate, n))).astype(np.int64)
+
+
+def bursty_arrivals(rng, n, rate, batch):
+    # Batches of geometric size (mean `batch`) arriving together, the batches
+    # themselves Poisson so the long-run rate is still `rate`
+    sizes = rng.geometric(1 / batch, n)
+    batch_of = np.repeat(np.arange(n), sizes)[:n]
+    starts = np.cumsum(rng.exponential(batch / rate, n))
+    return np.floor(starts[batch_of]).astype(np.int64)
+
+
+def exponential_bursts(rng, n, mean, shape):
+    return np.maximum(np.rint(rng.exponential(mean, n)), 1).astype(np.int64)
+
+
+def pareto_bursts(rng, n, mean, shape):
+    # Heavy tail with index `shape` (> 1), scaled to the requested mean
+    scale = mean * (shape - 1) / shape
+    return np.maximum(np.rint(scale * (1 + rng.pareto(shape, n))), 1).astype(np.int64)
+
+
+def uniform_priorities(rng, n, levels):
+    return rng.integers(0, levels, n)
+
+
+def skewed_priorities(rng, n, levels):
+    # Each level half as common as the one above it; 0 is the most urgent
+    return np.minimum(rng.geometric(0.5, n) - 1, levels - 1).astype(np.int64)
+
+
+def constant_priorities(rng, n, levels):
+    return np.zeros(n, dtype=np.int64)
+
+
+ARRIVALS = {'poisson': poisson_arrivals, 'bursty': bursty_arrivals}
+BURSTS = {'exponential': exponential_bursts, 'pareto': pareto_bursts}
+PRIORITIES = {'uniform': uniform_priorities, 'skewed': skewed_priorities,
+              'constant': constant_priorities}
+
+
+def generate(n, seed=None, arrivals='poisson', bursts='exponential', priorities='uniform',
+             load=0.9, mean_burst=5.0, shape=1.5, batch=8.0, levels=5):
+    # Random workload of n tasks; the same seed and options give the same
+    # workload. load is the offered CPU load, arrival rate times mean burst.
+    if arrivals not in ARRIVALS or bursts not in BURSTS or priorities not in PRIORITIES:
+        raise ValueError(f"Unknown distribution: {arrivals}, {bursts}, {priorities}")
+    if n < 0 or load <= 0 or mean_burst <= 0 or shape <= 1 or batch < 1 or levels < 1:
+        raise ValueError("Invalid workload parameters!")
+    rng = np.random.default_rng(seed)
+    arrival = ARRIVALS[arrivals](rng, n, load / mean_burst, batch)
+    burst = BURSTS[bursts](rng, n, mean_burst, shape)
+    priority = PRIORITIES[priorities](rng, n, levels)
+    return TaskTable(np.arange(1, n + 1), arrival, burst, priority)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m scheduler.generators',
+                                     description="Write a seeded synthetic workload.")
+    parser.add_argument('tasks', type=int, help="number of tasks")
+    parser.add_argument('-o', '--output', default='workload.csv', help="CSV or JSON Lines file")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--arrivals', choices=list(ARRIVALS), default='poisson')
+    parser.add_argument('--bursts', choices=list(BURSTS), default='exponential')
+    parser.add_argument('--priorities', choices=list(PRIORITIES), default='uniform')
+    parser.add_argument('--load', type=float, default=0.9,
+                        help="offered load, arrival rate times mean burst")
+    parser.add_argument('--mean-burst', type=float, default=5.0)
+    parser.add_argument('--shape', type=float, default=1.5, help="Pareto tail index")
+    parser.add_argument('--batch', type=float, default=8.0, help="mean bursty batch size")
+    parser.add_argument('--levels', type=int, default=5, help="number of priority levels")
+    args = parser.parse_args(argv)
+
+    try:
+        table = generate(args.tasks, args.seed, args.arrivals, args.bursts, args.priorities,
+                         args.load, args.mean_burst, args.shape, args.batch, args.levels)
+        write_workload(args.output, table)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import numpy as np
+
+from .algorithms import ENGINES, Checkpoints
+
+
+class IncrementalRunner:
+    # Re-runs one algorithm on a workload that changes between runs. Tasks may
+    # be appended or edited in place (same row, same ID); the run then resumes
+    # from the last checkpoint taken before the earliest arrival the change
+    # touches. Removed or reordered rows fall back to a full run.
+    def __init__(self, algorithm, quantum=0):
+        if algorithm not in ENGINES:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        if algorithm == 'round_robin' and quantum <= 0:
+            raise ValueError("Time quantum must be positive!")
+        self.algorithm = algorithm
+        self.quantum = quantum
+        self.table = None
+        self.schedule = None
+        self.checkpoints = None
+        self.resumed_at = None
+
+    def changed_since(self, table):
+        # Earliest arrival affected since the previous run; inf if nothing
+        # changed and None if the run has to start from scratch
+        old = self.table
+        if old is None or len(table) < len(old):
+            return None
+        n = len(old)
+        if (table.id[:n] != old.id).any():
+            return None
+        changed = ((table.arrival[:n] != old.arrival) | (table.burst[:n] != old.burst) |
+                   (table.priority[:n] != old.priority))
+        times = np.concatenate((old.arrival[changed], table.arrival[:n][changed], table.arrival[n:]))
+        return times.min() if len(times) else np.inf
+
+    def run(self, table, progress=None, counters=None):
+        since = self.changed_since(table)
+        if since == np.inf:
+            return self.schedule
+
+        kept = []
+        resume = None
+        if since is not None:
+            kept = [state for state in self.checkpoints.items if state['time'] < since]
+            if kept:
+                # The engine snapshots the state it resumes from again
+                resume = (kept.pop(), self.schedule)
+        self.resumed_at = resume[0]['time'] if resume else None
+
+        checkpoints = Checkpoints(len(table), kept)
+        args = (table, self.quantum) if self.algorithm == 'round_robin' else (table,)
+        schedule = ENGINES[self.algorithm](*args, progress, checkpoints=checkpoints, resume=resume,
+                                           counters=counters)
+        self.table, self.schedule, self.checkpoints = table, schedule, checkpoints
+        return schedule
@@ -0,0 +1,10 @@
+# Display names of the algorithms, kept free of numpy so the GUI can build its
+# window before the engines are loaded
+LABELS = {
+    'fcfs': "First-Come, First-Served (FCFS)",
+    'sjf': "Shortest Job First (SJF)",
+    'priority_non_preemptive': "Priority (Non-Preemptive)",
+    'priority_preemptive': "Priority (Preemptive)",
+    'round_robin': "Round Robin (RR)",
+    'srtf': "Shortest Remaining Time First (SRTF)",
+}
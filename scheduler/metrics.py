@@ -0,0 +1,105 @@
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+LATENCIES = ('waiting', 'turnaround', 'response')
+
+# Segments processed per step by the whole-chart reductions, so memory-mapped
+# Gantt charts are never loaded in one piece
+CHUNK_SIZE = 1 << 20
+
+
+def summarize(schedule):
+    n = len(schedule.table)
+    completion_time = int(schedule.finish.max())
+    return {
+        'avg_waiting': float(schedule.waiting.mean()),
+        'avg_turnaround': float(schedule.turnaround.mean()),
+        'avg_response': float(schedule.response.mean()),
+        'throughput': n / completion_time if completion_time else 0.0,
+    }
+
+
+def busy_time(gantt, t0, t1):
+    # Time within [t0, t1] the CPU spent running tasks; only the segments
+    # overlapping the window are read
+    window = gantt.window(t0, t1)
+    busy = 0
+    for lo in range(0, len(window), CHUNK_SIZE):
+        part = window[lo:lo + CHUNK_SIZE]
+        busy += int((np.minimum(part.end, t1) - np.maximum(part.start, t0)).clip(min=0).sum())
+    return busy
+
+
+def utilization(gantt, t0, t1):
+    # Fraction of [t0, t1] the CPUs were busy, averaged over the cores
+    return busy_time(gantt, t0, t1) / (gantt.cores * (t1 - t0)) if t1 > t0 else 0.0
+
+
+def core_utilization(gantt, t0, t1):
+    # Fraction of [t0, t1] each core was busy
+    return [utilization(gantt.lane(core), t0, t1) for core in range(gantt.cores)]
+
+
+def context_switches(gantt):
+    # Dispatches of a different task than the one that held the core before;
+    # a task continuing after its own quantum is not a switch
+    if gantt.core is not None:
+        return sum(context_switches(gantt.lane(core)) for core in range(gantt.cores))
+    switches = 0
+    for lo in range(1, len(gantt), CHUNK_SIZE):
+        hi = min(lo + CHUNK_SIZE, len(gantt))
+        switches += int(np.count_nonzero(gantt.task[lo:hi] != gantt.task[lo - 1:hi - 1]))
+    return switches
+
+
+def latency(name, values):
+    # avg/p50/p95/p99/max of one per-task latency column
+    if not len(values):
+        return dict.fromkeys([f'avg_{name}'] + [f'p{p}_{name}' for p in PERCENTILES] +
+                             [f'max_{name}'], 0.0)
+    stats = {f'avg_{name}': float(values.mean())}
+    for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        stats[f'p{p}_{name}'] = float(value)
+    stats[f'max_{name}'] = float(values.max())
+    return stats
+
+
+def _stats(columns, gantt, t0, t1):
+    completed = len(columns['waiting'])
+    stats = {'start': t0, 'end': t1, 'completed': completed,
+             'throughput': completed / (t1 - t0) if t1 > t0 else 0.0,
+             'utilization': utilization(gantt, t0, t1),
+             'context_switches': context_switches(gantt)}
+    for name in LATENCIES:
+        stats.update(latency(name, columns[name]))
+    return stats
+
+
+def describe(schedule, t0=None, t1=None):
+    # Tail latencies, CPU utilization and context switches over the whole run,
+    # or over the tasks completing in [t0, t1) and the CPU time inside it
+    columns = {name: getattr(schedule, name) for name in LATENCIES}
+    if t0 is None:
+        return _stats(columns, schedule.gantt, 0, int(schedule.finish.max(initial=0)))
+    done = (schedule.finish >= t0) & (schedule.finish < t1)
+    return _stats({name: values[done] for name, values in columns.items()},
+                  schedule.gantt.window(t0, t1), t0, t1)
+
+
+def sliding_windows(schedule, width, step=None):
+    # describe() over [t, t + width) for t = 0, step, 2 * step, ... until every
+    # completion is covered. Tasks are sorted by finish time once, so each window is
+    # a slice.
+    if width <= 0 or (step is not None and step <= 0):
+        raise ValueError("Window width and step must be positive!")
+    order = np.argsort(schedule.finish, kind='stable')
+    finish = schedule.finish[order]
+    columns = {name: getattr(schedule, name)[order] for name in LATENCIES}
+
+    windows = []
+    for t0 in range(0, int(finish.max(initial=0)) + 1, step or width):
+        t1 = t0 + width
+        lo, hi = np.searchsorted(finish, (t0, t1))
+        windows.append(_stats({name: values[lo:hi] for name, values in columns.items()},
+                              schedule.gantt.window(t0, t1), t0, t1))
+    return windows
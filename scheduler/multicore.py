@@ -0,0 +1,195 @@
+import heapq
+from array import array
+
+import numpy as np
+
+from .algorithms import PROGRESS_INTERVAL, _check
+from .gantt import Segments
+from .profiling import measured
+from .queues import FifoQueue, HeapQueue
+from .table import Schedule
+
+# Ready queue order of each algorithm on a multi-core machine: the column it
+# ranks tasks by (None for arrival order) and whether a better-ranked task
+# preempts a running one
+POLICIES = {
+    'fcfs': (None, False),
+    'sjf': ('burst', False),
+    'priority_non_preemptive': ('priority', False),
+    'priority_preemptive': ('priority', True),
+    'round_robin': (None, False),
+    'srtf': ('remaining', True),
+}
+
+
+def smp(table, algorithm, cores, quantum=0, stealing=False, progress=None, counters=None):
+    # Event-driven run on `cores` CPUs. Events are arrivals and core timers (a
+    # completion or the end of a Round Robin slice); timers, idle cores and
+    # ready queues are heaps, so a run costs O(events log n) for any core count.
+    #
+    # Without stealing all cores share one ready queue, and an arrival that
+    # outranks the worst running task preempts it. With stealing every core has
+    # its own queue, arrivals are spread over the cores in turn, preemption
+    # only happens within a core, and a core whose queue runs dry takes the
+    # next task from the longest other queue. One core reproduces run().
+    # counters is filled in as by run(), summing the pushes and pops of all
+    # ready queues.
+    _check(algorithm, quantum)
+    if cores < 1:
+        raise ValueError("Number of cores must be positive!")
+    key, preemptive = POLICIES[algorithm]
+    sliced = algorithm == 'round_robin'
+
+    ids = table.id.tolist()
+    arrival = table.arrival.tolist()
+    order = table.order.tolist()
+    n = len(table)
+    remaining = table.burst.tolist()
+    start = [-1] * n
+    finish = [-1] * n
+    if key is None:
+        queues = [FifoQueue() for _ in range(cores if stealing else 1)]
+    else:
+        rank = (remaining if key == 'remaining' else getattr(table, key).tolist()).__getitem__
+        queues = [HeapQueue(rank) for _ in range(cores if stealing else 1)]
+    queue_of = list(range(cores)) if stealing else [0] * cores
+
+    running = [None] * cores
+    segment_start = [0] * cores
+    running_key = [0] * cores  # priority, or projected finish time for SRTF
+    version = [0] * cores      # bumped on every dispatch to retire old timers
+    idle = list(range(cores))
+    timers = []   # (time, core, version)
+    worst = []    # (-running_key, core, version), for preemption from the shared queue
+    longest = []  # (-queue length, core), for picking a steal victim
+    gantt_task, gantt_start, gantt_end, gantt_core = array('q'), array('q'), array('q'), array('q')
+
+    def dispatch(core, task, t):
+        running[core] = task
+        segment_start[core] = t
+        version[core] += 1
+        if start[task] == -1:
+            start[task] = t
+        end = t + (min(quantum, remaining[task]) if sliced else remaining[task])
+        heapq.heappush(timers, (end, core, version[core]))
+        if preemptive:
+            running_key[core] = end if key == 'remaining' else rank(task)
+            if not stealing:
+                heapq.heappush(worst, (-running_key[core], core, version[core]))
+
+    def stop(core, t):
+        # Takes the running task off the core and records its segment
+        task = running[core]
+        running[core] = None
+        remaining[task] -= t - segment_start[core]
+        gantt_task.append(ids[task])
+        gantt_start.append(segment_start[core])
+        gantt_end.append(t)
+        gantt_core.append(core)
+        return task
+
+    def outranked(core, queue, t):
+        # True if the best queued task should replace the one running on core
+        current = running_key[core] - t if key == 'remaining' else running_key[core]
+        return queue.peek_key() < current
+
+    def resized(core):
+        heapq.heappush(longest, (-len(queues[core]), core))
+        if len(longest) > 4 * cores + 64:
+            longest[:] = [(-len(queue), c) for c, queue in enumerate(queues) if queue]
+            heapq.heapify(longest)
+
+    def victim():
+        # Core with the longest queue, lowest index on ties
+        while longest:
+            length, core = longest[0]
+            if -length == len(queues[core]) and length:
+                return core
+            heapq.heappop(longest)
+        return None
+
+    i = 0
+    done = 0
+    queued = 0
+    placed = 0
+    events = 0
+    while done < n:
+        events += 1
+        if progress is not None and not events % PROGRESS_INTERVAL:
+            progress(done, n)
+
+        while timers and timers[0][2] != version[timers[0][1]]:
+            heapq.heappop(timers)
+        t = timers[0][0] if timers else arrival[order[i]]
+        if i < n and arrival[order[i]] < t:
+            t = arrival[order[i]]
+
+        # Completions and expired slices first, then arrivals, then the
+        # preempted slices go back behind the arrivals as in round_robin()
+        expired = []
+        while timers and timers[0][0] == t:
+            _, core, timer_version = heapq.heappop(timers)
+            if timer_version != version[core]:
+                continue
+            task = stop(core, t)
+            heapq.heappush(idle, core)
+            if remaining[task] > 0:
+                expired.append((core, task))
+            else:
+                finish[task] = t
+                done += 1
+
+        touched = set()
+        while i < n and arrival[order[i]] <= t:
+            core = placed % cores if stealing else 0
+            placed += 1
+            queues[queue_of[core]].push(order[i])
+            queued += 1
+            touched.add(core)
+            i += 1
+        for core, task in expired:
+            queues[queue_of[core]].push(task)
+            queued += 1
+            touched.add(core)
+        if stealing:
+            for core in touched:
+                resized(core)
+
+        # Idle cores take their own next task or steal one, lowest core first
+        while idle and queued:
+            core = heapq.heappop(idle)
+            source = queue_of[core]
+            if not queues[source]:
+                source = victim()
+            dispatch(core, queues[source].pop(), t)
+            queued -= 1
+            if stealing:
+                resized(source)
+
+        if not preemptive:
+            continue
+        if stealing:
+            for core in touched:
+                queue = queues[core]
+                if running[core] is not None and queue and outranked(core, queue, t):
+                    queue.push_front(stop(core, t))
+                    dispatch(core, queue.pop(), t)
+            continue
+        queue = queues[0]
+        while queue:
+            while worst and (worst[0][2] != version[worst[0][1]] or running[worst[0][1]] is None):
+                heapq.heappop(worst)
+            if not worst or not outranked(worst[0][1], queue, t):
+                break
+            core = heapq.heappop(worst)[1]
+            queue.push_front(stop(core, t))
+            dispatch(core, queue.pop(), t)
+    measured(counters, events, queues)
+
+    task, seg_start, seg_end, core = (np.frombuffer(column, dtype=np.int64) for column in
+                                      (gantt_task, gantt_start, gantt_end, gantt_core))
+    by_lane = np.lexsort((seg_start, core))
+    start = np.array(start, dtype=np.int64)
+    return Schedule(table, start, finish, start - table.arrival,
+                    Segments(task[by_lane], seg_start[by_lane], seg_end[by_lane],
+                             core[by_lane] if cores > 1 else None, cores))
@@ -0,0 +1,146 @@
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .algorithms import ENGINES, Cancelled, run
+from .metrics import summarize
+from .multicore import smp
+from .table import TaskTable
+
+# (workload fingerprint, quantum) -> Round Robin metrics, least recently used
+# first; at most SWEEP_CACHE_SIZE points are kept
+SWEEP_CACHE_SIZE = 4096
+_sweep_cache = OrderedDict()
+
+# Seconds between progress callbacks while waiting on worker processes
+POLL_SECONDS = 0.1
+
+
+@contextmanager
+def _shared_table(table):
+    # Copy the input columns into one shared block that workers attach to by
+    # name, followed by a stop flag byte; yields the name and a function that
+    # sets the flag
+    n = len(table)
+    if not n:
+        raise ValueError("No tasks added!")
+    shm = shared_memory.SharedMemory(create=True, size=4 * n * 8 + 1)
+    try:
+        columns = np.ndarray((4, n), dtype=np.int64, buffer=shm.buf)
+        columns[:] = (table.id, table.arrival, table.burst, table.priority)
+        del columns
+        shm.buf[4 * n * 8] = 0
+
+        def stop():
+            shm.buf[4 * n * 8] = 1
+        yield shm.name, stop
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _run_shared(name, n, algorithm, quantum, cores=1, stealing=False):
+    # Worker side: rebuild the table from the shared block, ship back metrics
+    # only; the engine gives up at its next progress callback once the stop
+    # flag is set
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        columns = np.ndarray((4, n), dtype=np.int64, buffer=shm.buf)
+        table = TaskTable(*columns)
+        del columns
+
+        def progress(done, total):
+            if shm.buf[4 * n * 8]:
+                raise Cancelled()
+        if cores > 1:
+            schedule = smp(table, algorithm, cores, quantum, stealing, progress)
+        else:
+            schedule = run(algorithm, table, quantum, progress)
+    finally:
+        shm.close()
+    return summarize(schedule)
+
+
+def _results(futures, stop, progress=None):
+    # {key: result} of {key: future}. progress(done, total) is called as the
+    # futures complete and every POLL_SECONDS in between; if it raises (see
+    # Cancelled), or a worker fails, the futures not yet started are cancelled
+    # and the running ones stopped, so the pool shuts down promptly.
+    pending = set(futures.values())
+    try:
+        while pending:
+            if progress is not None:
+                progress(len(futures) - len(pending), len(futures))
+            done, pending = wait(pending, POLL_SECONDS if progress is not None else None,
+                                 FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    raise future.exception()
+        return {key: future.result() for key, future in futures.items()}
+    except BaseException:
+        for future in futures.values():
+            future.cancel()
+        stop()
+        raise
+
+
+def compare(table, algorithms=None, quantum=2, max_workers=None, cores=1, stealing=False,
+            progress=None):
+    # Run several algorithms on one workload in parallel, on `cores` simulated
+    # CPUs each; returns {name: metrics}. progress(done, total) counts finished
+    # algorithms and may raise Cancelled to stop the run.
+    algorithms = list(algorithms or ENGINES)
+    with _shared_table(table) as (name, stop):
+        with ProcessPoolExecutor(max_workers=max_workers or len(algorithms)) as pool:
+            futures = {algorithm: pool.submit(_run_shared, name, len(table), algorithm, quantum,
+                                              cores, stealing)
+                       for algorithm in algorithms}
+            return _results(futures, stop, progress)
+
+
+def sweep_quantum(table, quanta, max_workers=None, progress=None):
+    # Round Robin metrics for every quantum, {quantum: metrics}; points already
+    # computed for this workload come from the cache. progress is as for
+    # compare(), counting the quanta not cached.
+    quanta = sorted(set(quanta))
+    if not quanta or quanta[0] <= 0:
+        raise ValueError("Time quantum must be positive!")
+
+    key = table.fingerprint()
+    results = {}
+    for q in quanta:
+        if (key, q) in _sweep_cache:
+            _sweep_cache.move_to_end((key, q))
+            results[q] = _sweep_cache[key, q]
+    missing = [q for q in quanta if q not in results]
+    if missing:
+        with _shared_table(table) as (name, stop):
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = {q: pool.submit(_run_shared, name, len(table), 'round_robin', q)
+                           for q in missing}
+                for q, metrics in _results(futures, stop, progress).items():
+                    results[q] = _sweep_cache[key, q] = metrics
+        while len(_sweep_cache) > SWEEP_CACHE_SIZE:
+            _sweep_cache.popitem(last=False)
+    return {q: results[q] for q in quanta}
+
+
+def parse_range(text):
+    # "start:stop[:step]", both ends inclusive; empty ranges are rejected
+    try:
+        parts = [int(part) for part in text.split(':')]
+    except ValueError:
+        raise ValueError(f"Invalid range: {text}")
+    if len(parts) == 1:
+        parts = parts * 2
+    if len(parts) not in (2, 3) or (len(parts) == 3 and parts[2] <= 0):
+        raise ValueError(f"Invalid range: {text}")
+    start, stop = parts[:2]
+    step = parts[2] if len(parts) == 3 else 1
+    values = list(range(start, stop + 1, step))
+    if not values:
+        raise ValueError(f"Invalid range: {text}")
+    return values
@@ -0,0 +1,103 @@
+import cProfile
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+# Counters of one run. An engine handed a dict as counters= measures its
+# scheduling events (iterations of its event loop) and ready queue pushes and
+# pops; the closed-form paths have neither and leave them None, as does a run
+# served from the cache. The rest are read off the output: every segment ends
+# in either the task's completion or a preemption (an expired Round Robin
+# quantum or a migration to another core counts as one), so preemptions are
+# the segments that did not complete a task.
+MEASURED = ('events', 'queue_pushes', 'queue_pops')
+COUNTERS = MEASURED + ('segments', 'completed', 'preemptions')
+
+
+def engine_counters():
+    # Counter dict to pass to an engine; None means not applicable
+    return dict.fromkeys(COUNTERS)
+
+
+def measured(counters, events, queues):
+    # Called by an engine at the end of its run
+    if counters is not None:
+        counts = [queue.counts() for queue in queues]
+        counters.update(events=events, queue_pushes=sum(pushes for pushes, _ in counts),
+                        queue_pops=sum(pops for _, pops in counts))
+
+
+def output_counters(counters, completed, segments):
+    counters.update(segments=segments, completed=completed, preemptions=segments - completed)
+
+
+class Profiler:
+    # Opt-in instrumentation of a session: wall and CPU time per phase, summed
+    # over repeated phases, and engine counters per run. CPU time is that of
+    # the calling thread, so phases on a worker thread are measured correctly.
+    def __init__(self):
+        self.phases = {}
+        self.counters = {}
+
+    @contextmanager
+    def phase(self, name):
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            entry = self.phases.setdefault(name, {'wall': 0.0, 'cpu': 0.0, 'calls': 0})
+            entry['wall'] += time.perf_counter() - wall
+            entry['cpu'] += time.thread_time() - cpu
+            entry['calls'] += 1
+
+    def engine(self, name):
+        # Counter dict to hand to the engine of run name
+        return self.counters.setdefault(name, engine_counters())
+
+    def count(self, name, schedule):
+        # Counters of a finished run
+        output_counters(self.engine(name), len(schedule.table), len(schedule.gantt))
+
+    def sink(self, name):
+        # Event sink that records the counters of a streamed run when it closes
+        return CounterSink(self, name)
+
+    def as_dict(self):
+        return {'phases': self.phases, 'counters': self.counters}
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+
+class CounterSink:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.segments = 0
+        self.completed = 0
+
+    def segment(self, task, start, end):
+        self.segments += 1
+
+    def finish(self, task, start, finish):
+        self.completed += 1
+
+    def close(self):
+        output_counters(self.profiler.engine(self.name), self.completed, self.segments)
+
+
+def phase(profiler, name):
+    # profiler.phase(name), or nothing when instrumentation is off
+    return nullcontext() if profiler is None else profiler.phase(name)
+
+
+def profile_call(path, func, *args, **kwargs):
+    # Runs func under cProfile and dumps the stats to path for pstats/snakeviz
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profile.disable()
+        profile.dump_stats(path)
@@ -0,0 +1,85 @@
+import heapq
+from collections import deque
+from itertools import chain
+
+import numpy as np
+
+# snapshot() returns a tuple of compact int64 arrays whose first element is the
+# queued tasks in queue order. counts() returns the pushes and pops so far,
+# those before a restored snapshot included; every task pushed has either been
+# popped or is still queued, so pops need no counter of their own.
+
+
+class HeapQueue:
+    # Ready queue ordered by key(task); equal keys leave in push order
+    def __init__(self, key):
+        self.key = key
+        self.heap = []
+        self.pushed = 0
+        self.preempted = 0
+
+    def push(self, task):
+        self.pushed += 1
+        heapq.heappush(self.heap, (self.key(task), self.pushed, task))
+
+    def push_front(self, task):
+        # A preempted task goes ahead of queued tasks with an equal key
+        self.preempted -= 1
+        heapq.heappush(self.heap, (self.key(task), self.preempted, task))
+
+    def pop(self):
+        return heapq.heappop(self.heap)[2]
+
+    def peek_key(self):
+        return self.heap[0][0]
+
+    def items(self):
+        return [entry[2] for entry in self.heap]
+
+    def counts(self):
+        pushes = self.pushed - self.preempted
+        return pushes, pushes - len(self.heap)
+
+    def snapshot(self):
+        # Tasks and tie-breaking sequence numbers in heap order; keys are
+        # recomputed on restore, so key(task) must give the same value again
+        heap = np.fromiter(chain.from_iterable(self.heap), np.int64, 3 * len(self.heap))
+        heap = heap.reshape(-1, 3)
+        return heap[:, 2].copy(), heap[:, 1].copy(), self.pushed, self.preempted
+
+    def restore(self, state):
+        tasks, order, self.pushed, self.preempted = state
+        key = self.key
+        self.heap = [(key(task), seq, task) for task, seq in zip(tasks.tolist(), order.tolist())]
+
+    def __len__(self):
+        return len(self.heap)
+
+
+class FifoQueue:
+    def __init__(self):
+        self.queue = deque()
+        self.pushed = 0
+
+    def push(self, task):
+        self.pushed += 1
+        self.queue.append(task)
+
+    def pop(self):
+        return self.queue.popleft()
+
+    def items(self):
+        return list(self.queue)
+
+    def counts(self):
+        return self.pushed, self.pushed - len(self.queue)
+
+    def snapshot(self):
+        return np.fromiter(self.queue, np.int64, len(self.queue)), self.pushed
+
+    def restore(self, state):
+        tasks, self.pushed = state
+        self.queue = deque(tasks.tolist())
+
+    def __len__(self):
+        return len(self.queue)
@@ -0,0 +1,67 @@
+import csv
+import json
+import os
+
+from .gantt import GANTT_FIELDS
+from .metrics import LATENCIES, PERCENTILES
+from .storage import write_schedule
+
+RESULT_FIELDS = ('id', 'arrival', 'burst', 'priority', 'start', 'finish',
+                 'turnaround', 'waiting', 'response')
+METRIC_FIELDS = ('avg_waiting', 'avg_turnaround', 'avg_response', 'throughput')
+# Keys of metrics.describe(), and of each of its sliding windows
+DETAIL_FIELDS = (('completed', 'throughput', 'utilization', 'context_switches') +
+                 tuple(f'{stat}_{name}' for name in LATENCIES
+                       for stat in ('avg',) + tuple(f'p{p}' for p in PERCENTILES) + ('max',)))
+WINDOW_FIELDS = ('start', 'end') + DETAIL_FIELDS
+
+
+def write_csv(path, rows, fields):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_metrics(out_dir, metrics, fmt='csv', name='metrics', key='algorithm',
+                  fields=METRIC_FIELDS):
+    # metrics is keyed by algorithm name (or quantum for a sweep)
+    os.makedirs(out_dir, exist_ok=True)
+    if fmt == 'json':
+        with open(os.path.join(out_dir, f'{name}.json'), 'w') as f:
+            json.dump(metrics, f, indent=2)
+    else:
+        write_csv(os.path.join(out_dir, f'{name}.csv'),
+                  [{key: k, **m} for k, m in metrics.items()],
+                  (key,) + fields)
+
+
+def write_windows(out_dir, name, windows, fmt='csv'):
+    # Sliding-window metrics of one run as <name>_windows.csv (or .json)
+    os.makedirs(out_dir, exist_ok=True)
+    if fmt == 'json':
+        with open(os.path.join(out_dir, f'{name}_windows.json'), 'w') as f:
+            json.dump(windows, f)
+    else:
+        write_csv(os.path.join(out_dir, f'{name}_windows.csv'), windows, WINDOW_FIELDS)
+
+
+def write_results(out_dir, results, metrics, fmt='csv', quantum=0):
+    # results and metrics are keyed by algorithm name
+    write_metrics(out_dir, metrics, fmt)
+    if fmt == 'bin':
+        for name, schedule in results.items():
+            write_schedule(os.path.join(out_dir, f'{name}.sched'), schedule, name,
+                           quantum if name == 'round_robin' else 0)
+        return
+    if fmt == 'json':
+        for name, schedule in results.items():
+            with open(os.path.join(out_dir, f'{name}.json'), 'w') as f:
+                json.dump({'tasks': [{k: t[k] for k in RESULT_FIELDS} for t in schedule.tasks()],
+                           'gantt': schedule.gantt.rows()}, f)
+        return
+
+    for name, schedule in results.items():
+        write_csv(os.path.join(out_dir, f'{name}_tasks.csv'), schedule.tasks(), RESULT_FIELDS)
+        write_csv(os.path.join(out_dir, f'{name}_gantt.csv'), schedule.gantt.rows(),
+                  GANTT_FIELDS if schedule.gantt.core is None else GANTT_FIELDS + ('core',))
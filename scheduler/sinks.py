@@ -0,0 +1,86 @@
+import csv
+import os
+
+from .algorithms import SEGMENT
+from .report import GANTT_FIELDS, RESULT_FIELDS
+
+
+def drain(events, *sinks):
+    # Feeds an engine event stream to every sink and closes them at the end,
+    # also when the run fails or is cancelled
+    segment = [sink.segment for sink in sinks]
+    finish = [sink.finish for sink in sinks]
+    try:
+        for kind, task, start, end in events:
+            for handler in (segment if kind is SEGMENT else finish):
+                handler(task, start, end)
+    finally:
+        for sink in sinks:
+            sink.close()
+
+
+class CsvSink:
+    # <name>_gantt.csv and <name>_tasks.csv with the same columns as
+    # write_results, written as events arrive; task rows are in completion order
+    def __init__(self, out_dir, table, name='schedule'):
+        os.makedirs(out_dir, exist_ok=True)
+        self.ids = table.id.tolist()
+        self.arrival = table.arrival.tolist()
+        self.burst = table.burst.tolist()
+        self.priority = table.priority.tolist()
+        self.gantt_file = open(os.path.join(out_dir, f'{name}_gantt.csv'), 'w', newline='')
+        self.tasks_file = open(os.path.join(out_dir, f'{name}_tasks.csv'), 'w', newline='')
+        self.gantt = csv.writer(self.gantt_file)
+        self.tasks = csv.writer(self.tasks_file)
+        self.gantt.writerow(GANTT_FIELDS)
+        self.tasks.writerow(RESULT_FIELDS)
+
+    def segment(self, task, start, end):
+        self.gantt.writerow((self.ids[task], start, end))
+
+    def finish(self, task, start, finish):
+        arrival = self.arrival[task]
+        turnaround = finish - arrival
+        self.tasks.writerow((self.ids[task], arrival, self.burst[task], self.priority[task], start,
+                             finish, turnaround, turnaround - self.burst[task], start - arrival))
+
+    def close(self):
+        self.gantt_file.close()
+        self.tasks_file.close()
+
+
+class RunningMetrics:
+    # Folds completions into the same averages as summarize() without keeping
+    # per-task results
+    def __init__(self, table):
+        self.arrival = table.arrival.tolist()
+        self.burst = table.burst.tolist()
+        self.count = 0
+        self.segments = 0
+        self.waiting = 0
+        self.turnaround = 0
+        self.response = 0
+        self.completion = 0
+
+    def segment(self, task, start, end):
+        self.segments += 1
+
+    def finish(self, task, start, finish):
+        arrival = self.arrival[task]
+        self.count += 1
+        self.turnaround += finish - arrival
+        self.waiting += finish - arrival - self.burst[task]
+        self.response += start - arrival
+        self.completion = max(self.completion, finish)
+
+    def close(self):
+        pass
+
+    def summary(self):
+        count = self.count or 1
+        return {
+            'avg_waiting': self.waiting / count,
+            'avg_turnaround': self.turnaround / count,
+            'avg_response': self.response / count,
+            'throughput': self.count / self.completion if self.completion else 0.0,
+        }
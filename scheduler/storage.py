@@ -0,0 +1,135 @@
+import os
+from array import array
+
+import numpy as np
+
+from .gantt import Segments
+from .table import Schedule, TaskTable
+
+# Schedule file layout, all integers little-endian int64 unless noted:
+#   header   HEADER, 64 bytes
+#   tasks    TASK_FIELDS as columns of n_tasks values each, in TaskTable order
+#   segments n_segments rows of (task ID, start, end), in time order, plus the
+#            core for multi-core schedules (cores > 1), in (core, start) order so
+#            each core's lane is contiguous
+# Readers reject files whose version they do not know. Version 1 files predate
+# the cores field and are single-core.
+MAGIC = b'CPUSCHED'
+VERSION = 2
+VERSIONS = (1, 2)
+HEADER = np.dtype([('magic', 'S8'), ('version', '<u4'), ('cores', '<u4'),
+                   ('tasks', '<i8'), ('segments', '<i8'), ('quantum', '<i8'),
+                   ('algorithm', 'S24')])
+TASK_FIELDS = ('id', 'arrival', 'burst', 'priority', 'start', 'finish')
+SEGMENT = np.dtype([('task', '<i8'), ('start', '<i8'), ('end', '<i8')])
+CORE_SEGMENT = np.dtype(SEGMENT.descr + [('core', '<i8')])
+
+# Segment rows ScheduleWriter buffers before each write
+BUFFER_ROWS = 65536
+
+
+def _header(table, segments, algorithm, quantum, cores=1):
+    header = np.zeros(1, dtype=HEADER)
+    header[0] = (MAGIC, VERSION, cores, len(table), segments, quantum,
+                 algorithm.encode('ascii'))
+    return header
+
+
+def _task_columns(table, start, finish):
+    return np.stack([np.asarray(column, dtype='<i8') for column in
+                     (table.id, table.arrival, table.burst, table.priority, start, finish)])
+
+
+def write_schedule(path, schedule, algorithm='', quantum=0):
+    gantt = schedule.gantt
+    segments = np.empty(len(gantt), dtype=SEGMENT if gantt.core is None else CORE_SEGMENT)
+    segments['task'], segments['start'], segments['end'] = gantt.task, gantt.start, gantt.end
+    if gantt.core is not None:
+        segments['core'] = gantt.core
+    with open(path + '.tmp', 'wb') as f:
+        _header(schedule.table, len(gantt), algorithm, quantum, gantt.cores).tofile(f)
+        _task_columns(schedule.table, schedule.start, schedule.finish).tofile(f)
+        segments.tofile(f)
+    os.replace(path + '.tmp', path)
+
+
+class ScheduleWriter:
+    # Event sink that writes a schedule file while the engine runs. Segments are
+    # appended in blocks after space reserved for the task columns, which are
+    # filled in on close together with the final header. A run that stops
+    # before every task finished leaves no file behind.
+    def __init__(self, path, table, algorithm='', quantum=0):
+        self.path = path
+        self.table = table
+        self.algorithm = algorithm
+        self.quantum = quantum
+        self.ids = table.id.tolist()
+        self.task_start = np.full(len(table), -1, dtype=np.int64)
+        self.task_finish = np.full(len(table), -1, dtype=np.int64)
+        self.segments = 0
+        self.rows = array('q')
+        self.file = open(path + '.tmp', 'wb')
+        self.file.seek(HEADER.itemsize + len(TASK_FIELDS) * 8 * len(table))
+
+    def segment(self, task, start, end):
+        self.rows.extend((self.ids[task], start, end))
+        if len(self.rows) >= 3 * BUFFER_ROWS:
+            self.flush()
+
+    def finish(self, task, start, finish):
+        self.task_start[task] = start
+        self.task_finish[task] = finish
+
+    def flush(self):
+        np.frombuffer(self.rows, dtype=np.int64).astype('<i8').tofile(self.file)
+        self.segments += len(self.rows) // 3
+        self.rows = array('q')
+
+    def close(self):
+        complete = (self.task_finish >= 0).all()
+        if complete:
+            self.flush()
+            self.file.seek(0)
+            _header(self.table, self.segments, self.algorithm, self.quantum).tofile(self.file)
+            _task_columns(self.table, self.task_start, self.task_finish).tofile(self.file)
+        self.file.close()
+        if complete:
+            os.replace(self.path + '.tmp', self.path)
+        else:
+            os.remove(self.path + '.tmp')
+
+
+def read_header(path):
+    header = np.fromfile(path, dtype=HEADER, count=1)
+    if len(header) != 1 or header['magic'][0] != MAGIC:
+        raise ValueError(f"Not a schedule file: {path}")
+    if header['version'][0] not in VERSIONS:
+        raise ValueError(f"Unsupported schedule file version: {header['version'][0]}")
+    n, segments = int(header['tasks'][0]), int(header['segments'][0])
+    cores = max(int(header['cores'][0]), 1)
+    row = SEGMENT.itemsize if cores == 1 else CORE_SEGMENT.itemsize
+    size = HEADER.itemsize + len(TASK_FIELDS) * 8 * n + row * segments
+    if os.path.getsize(path) < size:
+        raise ValueError(f"Truncated schedule file: {path}")
+    return {'tasks': n, 'segments': segments, 'quantum': int(header['quantum'][0]),
+            'algorithm': header['algorithm'][0].decode('ascii'), 'cores': cores}
+
+
+def read_schedule(path):
+    # Task columns are loaded; the segments stay memory-mapped, so opening a
+    # schedule costs the same however long its Gantt chart is
+    header = read_header(path)
+    n, m, cores = header['tasks'], header['segments'], header['cores']
+    tasks = np.fromfile(path, dtype='<i8', count=len(TASK_FIELDS) * n,
+                        offset=HEADER.itemsize).reshape(len(TASK_FIELDS), n)
+    columns = dict(zip(TASK_FIELDS, tasks))
+    if m:
+        segments = np.memmap(path, dtype=SEGMENT if cores == 1 else CORE_SEGMENT, mode='r',
+                             shape=(m,), offset=HEADER.itemsize + tasks.nbytes)
+        gantt = Segments(segments['task'], segments['start'], segments['end'],
+                         None if cores == 1 else segments['core'], cores)
+    else:
+        gantt = Segments(cores=cores)
+    table = TaskTable(columns['id'], columns['arrival'], columns['burst'], columns['priority'])
+    return Schedule(table, columns['start'], columns['finish'],
+                    columns['start'] - columns['arrival'], gantt)
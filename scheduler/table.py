@@ -0,0 +1,82 @@
+import hashlib
+
+import numpy as np
+
+COLUMNS = ('id', 'arrival', 'burst', 'priority', 'remaining', 'start', 'finish',
+                 'response', 'turnaround', 'waiting')
+
+
+def _column(values):
+    column = np.array(values, dtype=np.int64)
+    column.setflags(write=False)
+    return column
+
+
+class TaskTable:
+    # Columnar, read-only task input shared by every simulation run
+    def __init__(self, ids, arrival, burst, priority=None):
+        self.id = _column(ids)
+        self.arrival = _column(arrival)
+        self.burst = _column(burst)
+        self.priority = _column(np.zeros(len(self.id)) if priority is None else priority)
+        if not len(self.id) == len(self.arrival) == len(self.burst) == len(self.priority):
+            raise ValueError("Task columns must have the same length!")
+        if len(np.unique(self.id)) != len(self.id):
+            raise ValueError("Task ID must be unique!")
+        # Stable arrival order, ties keep insertion order
+        self.order = _column(np.argsort(self.arrival, kind='stable'))
+        self._fingerprint = None
+
+    @classmethod
+    def from_rows(cls, rows):
+        # rows of (id, arrival, burst, priority)
+        rows = list(rows)
+        if not rows:
+            return cls([], [], [], [])
+        ids, arrival, burst, priority = zip(*rows)
+        return cls(ids, arrival, burst, priority)
+
+    def __len__(self):
+        return len(self.id)
+
+    def fingerprint(self):
+        # Content hash of the input columns, stable across processes and runs
+        if self._fingerprint is None:
+            digest = hashlib.sha1()
+            for column in (self.id, self.arrival, self.burst, self.priority):
+                digest.update(column.tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+
+class Schedule:
+    # Output columns of one run, indexed like the TaskTable they came from, and
+    # the run's Gantt chart as Segments
+    def __init__(self, table, start, finish, response, gantt, remaining=None):
+        self.table = table
+        self.start = np.array(start, dtype=np.int64)
+        self.finish = np.array(finish, dtype=np.int64)
+        self.response = np.array(response, dtype=np.int64)
+        self.remaining = (np.zeros(len(table), dtype=np.int64) if remaining is None
+                          else np.array(remaining, dtype=np.int64))
+        self.gantt = gantt
+
+    @property
+    def turnaround(self):
+        return self.finish - self.table.arrival
+
+    @property
+    def waiting(self):
+        return self.turnaround - self.table.burst
+
+    def tasks(self):
+        # Per-task result dicts in arrival order
+        columns = {
+            'id': self.table.id, 'arrival': self.table.arrival, 'burst': self.table.burst,
+            'priority': self.table.priority, 'remaining': self.remaining, 'start': self.start,
+            'finish': self.finish, 'response': self.response, 'turnaround': self.turnaround,
+            'waiting': self.waiting,
+        }
+        order = self.table.order
+        values = [columns[field][order].tolist() for field in COLUMNS]
+        return [dict(zip(COLUMNS, row)) for row in zip(*values)]
@@ -0,0 +1,322 @@
+import argparse
+import csv
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .algorithms import ENGINES, run
+from .gantt import Segments
+from .metrics import describe
+from .report import DETAIL_FIELDS, write_metrics
+from .multicore import smp
+from .table import Schedule, TaskTable
+from .workload import write_workload
+
+# Traces are split into chunks of about this many bytes, each parsed by one
+# worker process into compact event columns
+CHUNK_BYTES = 64 * 2**20
+
+# Digits of the fractional timestamp kept per time unit of the replay
+UNITS = {'ms': 3, 'us': 6, 'ns': 9}
+
+# ftrace text (trace / trace_pipe) and perf sched script output. Comm names may
+# contain spaces, so fields are anchored on the key=value or pid [prio] parts.
+_STAMP = r'\[(\d+)\].*?\s(\d+)\.(\d+):\s+(?:sched:)?'
+_WAKE_STAMP = r'\[\d+\].*?\s(\d+)\.(\d+):\s+(?:sched:)?'
+_SWITCH = [
+    re.compile(_STAMP + r'sched_switch: .*? prev_pid=(\d+) prev_prio=-?\d+ prev_state=(\S+)'
+                        r' ==> .*? next_pid=(\d+) next_prio=(-?\d+)'),
+    re.compile(_STAMP + r'sched_switch: .*:(\d+) \[-?\d+\] (\S+) ==> .*:(\d+) \[(-?\d+)\]'),
+]
+_WAKEUP = [
+    re.compile(_WAKE_STAMP + r'sched_wakeup(?:_new)?: .*? pid=(\d+) prio=(-?\d+)'),
+    re.compile(_WAKE_STAMP + r'sched_wakeup(?:_new)?: .*:(\d+) \[(-?\d+)\]'),
+]
+
+# CSV exports have one row per event with these columns; `event` is optional
+# (sched_switch when absent) and a sched_wakeup row names the woken task in
+# next_pid/next_prio
+CSV_FIELDS = ('time', 'cpu', 'prev_pid', 'prev_prio', 'prev_state', 'next_pid', 'next_prio')
+
+# Bytes of text a worker decodes and converts at a time
+BLOCK_BYTES = 4 * 2**20
+
+
+def _match(patterns, line):
+    for pattern in patterns:
+        match = pattern.search(line)
+        if match:
+            return match
+    return None
+
+
+def _blocks(f, lo, hi):
+    # Lists of the lines whose first byte lies in [lo, hi), about BLOCK_BYTES
+    # of text at a time
+    if lo:
+        f.seek(lo - 1)
+        f.readline()
+    while f.tell() < hi:
+        data = f.read(min(BLOCK_BYTES, hi - f.tell()))
+        if not data:
+            return
+        if not data.endswith(b'\n'):
+            data += f.readline()
+        yield data.decode('utf-8', 'replace').splitlines()
+
+
+def _ticks(seconds, fraction, digits):
+    # Whole time units from the integer and fractional parts of timestamps
+    fraction = np.char.ljust(np.array(fraction, dtype=str), digits, '0').astype(f'U{digits}')
+    return np.array(seconds, dtype=np.int64) * 10 ** digits + fraction.astype(np.int64)
+
+
+def _switch_columns(rows, digits):
+    # (cpu, seconds, fraction, prev_pid, prev_state, next_pid, next_prio) strings
+    # to time, cpu, prev_pid, prev_runnable, next_pid, next_prio
+    if not rows:
+        return [np.empty(0, dtype) for dtype in SWITCH_DTYPES]
+    cpu, seconds, fraction, prev_pid, state, next_pid, next_prio = zip(*rows)
+    return [_ticks(seconds, fraction, digits), np.array(cpu, dtype=np.int32),
+            np.array(prev_pid, dtype=np.int32), np.char.startswith(np.array(state), 'R'),
+            np.array(next_pid, dtype=np.int32), np.array(next_prio, dtype=np.int32)]
+
+
+def _wakeup_columns(rows, digits):
+    # (seconds, fraction, pid, prio) strings to time, pid, prio
+    if not rows:
+        return [np.empty(0, dtype) for dtype in WAKEUP_DTYPES]
+    seconds, fraction, pid, prio = zip(*rows)
+    return [_ticks(seconds, fraction, digits), np.array(pid, dtype=np.int32),
+            np.array(prio, dtype=np.int32)]
+
+
+SWITCH_DTYPES = (np.int64, np.int32, np.int32, bool, np.int32, np.int32)
+WAKEUP_DTYPES = (np.int64, np.int32, np.int32)
+
+
+def _parse_chunk(path, lo, hi, fmt, digits, header=None):
+    # Worker side: one byte range of the trace as compact columns, switch
+    # events (time, cpu, prev_pid, prev_runnable, next_pid, next_prio) and
+    # wakeups (time, pid, prio). Text is converted a block at a time, so a
+    # worker holds at most BLOCK_BYTES of it as Python strings.
+    switches, wakeups = [], []
+    with open(path, 'rb') as f:
+        for lines in _blocks(f, lo, hi):
+            switch_rows, wakeup_rows = [], []
+            if fmt == 'csv':
+                column = [header.index(field) for field in CSV_FIELDS]
+                event = header.index('event') if 'event' in header else None
+                for row in csv.reader(lines):
+                    if not row or row == header:
+                        continue
+                    time, cpu, prev_pid, _, state, next_pid, next_prio = (row[i] for i in column)
+                    seconds, _, fraction = time.strip().partition('.')
+                    if event is not None and row[event].startswith('sched_wakeup'):
+                        wakeup_rows.append((seconds, fraction, next_pid, next_prio))
+                    else:
+                        switch_rows.append((cpu, seconds, fraction, prev_pid, state, next_pid,
+                                            next_prio))
+            else:
+                for line in lines:
+                    if 'sched_switch' in line:
+                        match = _match(_SWITCH, line)
+                        if match is not None:
+                            switch_rows.append(match.groups())
+                    elif 'sched_wakeup' in line:
+                        match = _match(_WAKEUP, line)
+                        if match is not None:
+                            wakeup_rows.append(match.groups())
+            switches.append(_switch_columns(switch_rows, digits))
+            wakeups.append(_wakeup_columns(wakeup_rows, digits))
+
+    return _concatenate(switches, SWITCH_DTYPES), _concatenate(wakeups, WAKEUP_DTYPES)
+
+
+def _concatenate(blocks, dtypes):
+    # Column-wise concatenation of lists of column lists
+    return [np.concatenate([block[i] for block in blocks] or [np.empty(0, dtype)]).astype(dtype)
+            for i, dtype in enumerate(dtypes)]
+
+
+def trace_format(path):
+    # 'csv' for CSV exports, 'text' for ftrace/perf text, None for neither
+    # (a workload file)
+    lower = str(path).lower()
+    if lower.endswith(('.json', '.jsonl', '.ndjson')):
+        return None
+    if not lower.endswith('.csv'):
+        return 'text'
+    with open(path, newline='') as f:
+        header = next(csv.reader(f), [])
+    return 'csv' if 'prev_pid' in header else None
+
+
+def read_events(path, fmt=None, unit='us', max_workers=None, chunk_bytes=CHUNK_BYTES):
+    # Parses the trace in parallel, one chunk per worker; only the compact
+    # columns are kept, so memory is proportional to the number of events
+    # rather than the size of the text
+    fmt = fmt or trace_format(path)
+    if fmt not in ('csv', 'text'):
+        raise ValueError(f"Not a scheduler trace: {path}")
+    if unit not in UNITS:
+        raise ValueError(f"Unknown time unit: {unit}")
+    header = None
+    if fmt == 'csv':
+        with open(path, newline='') as f:
+            header = next(csv.reader(f), [])
+        missing = [field for field in CSV_FIELDS if field not in header]
+        if missing:
+            raise ValueError(f"Trace CSV is missing columns: {', '.join(missing)}")
+
+    size = os.path.getsize(path)
+    bounds = list(range(0, size, chunk_bytes)) + [size]
+    chunks = [(path, lo, hi, fmt, UNITS[unit], header) for lo, hi in zip(bounds, bounds[1:])]
+    if len(chunks) <= 1:
+        results = [_parse_chunk(*chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_parse_chunk, *zip(*chunks)))
+
+    return (_concatenate([result[0] for result in results], SWITCH_DTYPES),
+            _concatenate([result[1] for result in results], WAKEUP_DTYPES))
+
+
+def reconstruct(switches, wakeups):
+    # The recorded schedule as jobs: a job is one CPU burst of a thread, from
+    # its wakeup until it blocks or exits, across any number of preemptions.
+    # Arrival is the job's first wakeup after the thread's previous job ended
+    # (its first switch-in if the trace has no such wakeup), burst its time on
+    # CPU and priority the kernel priority it was switched in with; lower runs
+    # first, as in the engines. Jobs still runnable at the end of the trace are
+    # dropped. Times count from the first event.
+    time, cpu, prev_pid, prev_runnable, next_pid, next_prio = switches
+    if len(time) < 2:
+        raise ValueError("Trace has no sched_switch events!")
+    t0 = int(min(time.min(), wakeups[0].min(initial=time.min())))
+
+    # Time between consecutive switches on a CPU belongs to the task switched
+    # in by the first; pairs that disagree about it (lost events) are skipped
+    by_cpu = np.lexsort((time, cpu))
+    keep = ((cpu[by_cpu[1:]] == cpu[by_cpu[:-1]]) & (next_pid[by_cpu[:-1]] == prev_pid[by_cpu[1:]])
+            & (next_pid[by_cpu[:-1]] != 0))
+    index, after = by_cpu[:-1][keep], by_cpu[1:][keep]
+    del by_cpu, keep
+    pid = next_pid[index]
+    start = time[index] - t0
+    end = time[after] - t0
+    prio = next_prio[index]
+    cores, core = np.unique(cpu[index], return_inverse=True)
+    blocks = ~prev_runnable[after]
+    del index, after
+
+    by_pid = np.lexsort((start, pid))
+    pid, start, end, prio, core, blocks = (
+        column[by_pid] for column in (pid, start, end, prio, core, blocks))
+    new = np.ones(len(pid), dtype=bool)
+    new[1:] = (pid[1:] != pid[:-1]) | blocks[:-1]
+    first = np.flatnonzero(new)
+    last = np.append(first[1:], len(pid)) - 1
+    job = np.cumsum(new) - 1
+
+    # Earliest wakeup of the same thread after its previous job
+    wake_time, wake_pid = wakeups[0] - t0, wakeups[1]
+    pids, dense = np.unique(np.concatenate((pid[first], wake_pid)), return_inverse=True)
+    span = int(max(end.max(initial=0), wake_time.max(initial=0))) + 2
+    job_key = dense[:len(first)] * span
+    wake_keys = np.sort(dense[len(first):] * span + wake_time)
+    previous = np.maximum(first - 1, 0)
+    after = np.where((first > 0) & (pid[previous] == pid[first]), end[previous], 0)
+    candidate = np.searchsorted(wake_keys, job_key + after)
+    found = wake_keys[np.minimum(candidate, len(wake_keys) - 1)] if len(wake_keys) else job_key
+    woken = (candidate < len(wake_keys)) & (found <= job_key + start[first])
+    arrival = np.where(woken, found - job_key, start[first])
+
+    complete = blocks[last]
+    burst = np.add.reduceat(end - start, first) if len(first) else np.empty(0, np.int64)
+    jobs = np.flatnonzero(complete)
+    jobs = jobs[np.lexsort((start[first][jobs], arrival[jobs]))]
+    ids = np.zeros(len(first), dtype=np.int64)
+    ids[jobs] = np.arange(1, len(jobs) + 1)
+
+    table = TaskTable(ids[jobs], arrival[jobs], burst[jobs], prio[first][jobs])
+    segment = np.flatnonzero(complete[job])
+    segment = segment[np.lexsort((start[segment], core[segment]))]
+    gantt = Segments(ids[job[segment]], start[segment], end[segment],
+                     core[segment] if len(cores) > 1 else None, max(len(cores), 1))
+    recorded_start = start[first][jobs]
+    return Schedule(table, recorded_start, end[last][jobs], recorded_start - arrival[jobs], gantt)
+
+
+def load_trace(path, fmt=None, unit='us', max_workers=None, chunk_bytes=CHUNK_BYTES):
+    # Recorded schedule of a trace; its table is the workload to replay
+    return reconstruct(*read_events(path, fmt, unit, max_workers, chunk_bytes))
+
+
+def replay(recorded, algorithms=None, quantum=2, cores=None, stealing=False):
+    # describe() of the recorded schedule and of every algorithm run on the
+    # recorded jobs, by default on as many CPUs as the trace used
+    table = recorded.table
+    cores = cores or recorded.gantt.cores
+    results = {'recorded': describe(recorded)}
+    for name in algorithms or ENGINES:
+        if cores > 1:
+            schedule = smp(table, name, cores, quantum, stealing)
+        else:
+            schedule = run(name, table, quantum)
+        results[name] = describe(schedule)
+    return results
+
+
+# Columns printed by the command line comparison
+REPLAY_FIELDS = ('avg_waiting', 'p99_waiting', 'avg_turnaround', 'p99_turnaround',
+                 'avg_response', 'utilization', 'context_switches')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m scheduler.trace',
+        description="Replay a perf sched / ftrace sched_switch trace through the algorithms "
+                    "and compare them with the recorded schedule.")
+    parser.add_argument('trace', help="ftrace or perf sched script text, or a CSV export")
+    parser.add_argument('--format', choices=('text', 'csv'),
+                        help="trace format (default: from the file)")
+    parser.add_argument('--unit', choices=list(UNITS), default='us', help="replay time unit")
+    parser.add_argument('-a', '--algorithm', action='append', choices=list(ENGINES),
+                        help="algorithm to replay (repeatable, default: all)")
+    parser.add_argument('-q', '--quantum', type=int, default=2,
+                        help="Round Robin time quantum, in --unit")
+    parser.add_argument('--cores', type=int, help="simulated CPUs (default: as traced)")
+    parser.add_argument('--stealing', action='store_true',
+                        help="per-core run queues with work stealing")
+    parser.add_argument('-j', '--jobs', type=int, help="parser worker processes")
+    parser.add_argument('-o', '--output', default='results', help="output directory")
+    parser.add_argument('--workload', help="also write the reconstructed jobs as a workload file")
+    args = parser.parse_args(argv)
+    if args.cores is not None and args.cores < 1:
+        parser.error("Number of cores must be positive!")
+
+    try:
+        recorded = load_trace(args.trace, args.format, args.unit, args.jobs)
+        if not len(recorded.table):
+            parser.error("No complete jobs in trace!")
+        if args.workload:
+            write_workload(args.workload, recorded.table)
+        results = replay(recorded, args.algorithm, args.quantum, args.cores, args.stealing)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    write_metrics(args.output, results, name='replay', fields=DETAIL_FIELDS)
+    print(f"{len(recorded.table)} jobs, {len(recorded.gantt)} segments on "
+          f"{recorded.gantt.cores} CPUs, times in {args.unit}")
+    print(f"{'algorithm':<25}" + ''.join(f"{field:>18}" for field in REPLAY_FIELDS))
+    for name, m in results.items():
+        print(f"{name:<25}" + ''.join(f"{m[field]:>18.2f}" for field in REPLAY_FIELDS))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,42 @@
+import numpy as np
+
+
+def serve_in_order(arrival, burst):
+    # Start and finish times when tasks are served back to back in the given
+    # order (last axis), starting at time 0. finish[i] is the running maximum of
+    # arrival[j] + burst[j..i], i.e. cumsum(burst) + max(0, max_j<=i(arrival[j] - cumsum_before[j])).
+    total = np.cumsum(burst, axis=-1)
+    slack = np.maximum.accumulate(arrival - (total - burst), axis=-1)
+    finish = total + np.maximum(slack, 0)
+    return finish - burst, finish
+
+
+def fcfs_batch(arrival, burst):
+    # Closed-form FCFS for many workloads at once, one workload per row of the
+    # 2-D arrival and burst arrays. Returns start and finish in input order.
+    arrival = np.atleast_2d(np.asarray(arrival, dtype=np.int64))
+    burst = np.atleast_2d(np.asarray(burst, dtype=np.int64))
+    if arrival.shape != burst.shape:
+        raise ValueError("Arrival and burst arrays must have the same shape!")
+
+    order = np.argsort(arrival, axis=-1, kind='stable')
+    start_sorted, finish_sorted = serve_in_order(np.take_along_axis(arrival, order, -1),
+                                                 np.take_along_axis(burst, order, -1))
+    start = np.empty_like(start_sorted)
+    finish = np.empty_like(finish_sorted)
+    np.put_along_axis(start, order, start_sorted, -1)
+    np.put_along_axis(finish, order, finish_sorted, -1)
+    return start, finish
+
+
+def batch_metrics(arrival, burst, start, finish):
+    # Per-workload averages for the rows of a batch
+    turnaround = finish - arrival
+    completion = finish.max(axis=-1)
+    return {
+        'avg_waiting': (turnaround - burst).mean(axis=-1),
+        'avg_turnaround': turnaround.mean(axis=-1),
+        'avg_response': (start - arrival).mean(axis=-1),
+        'throughput': np.divide(arrival.shape[-1], completion,
+                                out=np.zeros(completion.shape), where=completion > 0),
+    }
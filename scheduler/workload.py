@@ -0,0 +1,148 @@
+import csv
+import json
+import os
+import re
+
+import numpy as np
+
+from .table import TaskTable
+
+CHUNK_SIZE = 65536
+TASK_FIELDS = ('id', 'arrival', 'burst', 'priority')
+
+# Characters of a .json workload read at a time; also the longest single task
+# object it may hold
+JSON_BLOCK_SIZE = 2**20
+
+_SPACE = re.compile(r'[ \t\n\r]*')
+_COMMA = re.compile(r'[ \t\n\r]*,[ \t\n\r]*')
+
+
+def _task_row(row):
+    try:
+        return (int(row['id']), int(row['arrival']), int(row['burst']),
+                int(row.get('priority') or 0))
+    except (KeyError, TypeError, ValueError, AttributeError):
+        raise ValueError(f"Invalid task row: {row}")
+
+
+def _json_records(f, block_size=JSON_BLOCK_SIZE):
+    # Items of the JSON list in f, decoded one at a time from block_size reads,
+    # so memory follows the block rather than the file. A value cut off at the
+    # end of a block is decoded again once more text is in.
+    decoder = json.JSONDecoder()
+    text, pos, eof = '', 0, False
+
+    def read():
+        nonlocal text, pos, eof
+        data = f.read(block_size)
+        text, pos, eof = text[pos:] + data, 0, not data
+
+    def token():
+        # Next non-whitespace character, '' at the end of the file
+        nonlocal pos
+        while True:
+            pos = _SPACE.match(text, pos).end()
+            if pos < len(text) or eof:
+                return text[pos:pos + 1]
+            read()
+
+    if token() != '[':
+        raise ValueError("JSON workload must be a list of tasks")
+    pos += 1
+    if token() == ']':
+        pos += 1
+    else:
+        while True:
+            try:
+                record, end = decoder.raw_decode(text, pos)
+                complete = end < len(text) or eof
+            except json.JSONDecodeError:
+                if eof or len(text) - pos > max(block_size, JSON_BLOCK_SIZE):
+                    raise
+                complete = False
+            if not complete:
+                read()
+                continue
+            yield record
+
+            # Usually the comma and the start of the next item are in this block
+            match = _COMMA.match(text, end)
+            if match is not None and match.end() < len(text):
+                pos = match.end()
+                continue
+            pos = end
+            delimiter = token()
+            pos += 1
+            if delimiter == ']':
+                break
+            if delimiter != ',':
+                raise ValueError("Invalid JSON workload: expected ',' or ']'")
+            token()
+    if token():
+        raise ValueError("Invalid JSON workload: extra data after the task list")
+
+
+def iter_chunks(path, chunk_size=CHUNK_SIZE, progress=None):
+    # Streams (id, arrival, burst, priority) rows in lists of up to chunk_size.
+    # .json is a list of task objects, .jsonl/.ndjson one object per line and
+    # anything else CSV with a header row; all three are read incrementally.
+    # progress(bytes_read, file_size) is called once per chunk.
+    size = os.path.getsize(path)
+    lower = str(path).lower()
+    with open(path, newline='') as f:
+        if lower.endswith('.json'):
+            records = _json_records(f)
+        elif lower.endswith(('.jsonl', '.ndjson')):
+            records = (json.loads(line) for line in f if line.strip())
+        else:
+            records = csv.DictReader(f)
+        chunk = []
+        for record in records:
+            chunk.append(_task_row(record))
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+                if progress is not None:
+                    progress(f.buffer.tell(), size)
+        if chunk:
+            yield chunk
+
+
+def read_tasks(path, known_ids=(), progress=None):
+    # All rows of a workload file. IDs must be unique within the file and must
+    # not already be in known_ids.
+    seen = set()
+    rows = []
+    for chunk in iter_chunks(path, progress=progress):
+        for row in chunk:
+            if row[0] in seen or row[0] in known_ids:
+                raise ValueError(f"Duplicate task ID: {row[0]}")
+            seen.add(row[0])
+        rows.extend(chunk)
+    return rows
+
+
+def load_workload(path):
+    return TaskTable.from_rows(read_tasks(path))
+
+
+def write_workload(path, table):
+    # Inverse of load_workload. CSV and JSON Lines are written a chunk at a time.
+    columns = (table.id, table.arrival, table.burst, table.priority)
+    lower = str(path).lower()
+    if lower.endswith('.json'):
+        with open(path, 'w') as f:
+            json.dump([dict(zip(TASK_FIELDS, row)) for row in zip(*(c.tolist() for c in columns))], f)
+        return
+
+    json_lines = lower.endswith(('.jsonl', '.ndjson'))
+    with open(path, 'w', newline='') as f:
+        if not json_lines:
+            f.write(','.join(TASK_FIELDS) + '\n')
+        for lo in range(0, len(table), CHUNK_SIZE):
+            rows = np.stack([column[lo:lo + CHUNK_SIZE] for column in columns], axis=1)
+            if json_lines:
+                f.writelines(json.dumps(dict(zip(TASK_FIELDS, row))) + '\n' for row in rows.tolist())
+            else:
+                np.savetxt(f, rows, fmt='%d', delimiter=',')
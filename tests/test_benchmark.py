@@ -0,0 +1,31 @@
+import json
+import os
+
+import pytest
+
+from scheduler.benchmark import (BASELINE, CHECK_TOLERANCE, STARTUP_BUDGET, benchmark, parse_sizes,
+                                 regressions, startup)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_memory_within_committed_baseline():
+    # Peak memory is machine independent, so it is checked on every run; timings
+    # are left to python -m scheduler.benchmark --check
+    with open(BASELINE) as f:
+        baseline = json.load(f)['results']
+    results = dict(benchmark(parse_sizes('2:4')))
+    assert set(results) == set(baseline)
+    assert regressions(results, baseline, CHECK_TOLERANCE, timing=False) == []
+
+
+@pytest.mark.parametrize('module', list(STARTUP_BUDGET))
+def test_startup_within_budget(module, monkeypatch):
+    # No deferred module may be loaded at import; the time gets the same
+    # CHECK_TOLERANCE slack as --check timings on shared CI machines
+    if module == 'cpu_scheduler_gui':
+        pytest.importorskip('tkinter')
+    monkeypatch.chdir(ROOT)
+    seconds, loaded = startup(module)
+    assert loaded == []
+    assert seconds < STARTUP_BUDGET[module] * CHECK_TOLERANCE
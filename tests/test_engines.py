@@ -0,0 +1,254 @@
+import math
+import random
+import time
+
+import pytest
+
+from scheduler import ENGINES, FifoQueue, HeapQueue, IncrementalRunner, TaskTable, run, smp
+from scheduler.profiling import engine_counters
+
+
+# Oracle: the original dict-based algorithms from the GUI, O(n^2) sorts and
+# one-unit ticks included, kept as the reference the engines must reproduce
+
+def oracle_fcfs(tasks):
+    tasks.sort(key=lambda x: x['arrival'])
+    current_time = 0
+    gantt = []
+
+    for task in tasks:
+        if current_time < task['arrival']:
+            current_time = task['arrival']
+
+        task['start'] = current_time
+        task['response'] = current_time - task['arrival']
+        gantt.append({'task': task['id'], 'start': current_time, 'end': current_time + task['burst']})
+
+        current_time += task['burst']
+        task['finish'] = current_time
+
+    return {'tasks': tasks, 'gantt': gantt}
+
+
+def oracle_non_preemptive(tasks, field):
+    tasks.sort(key=lambda x: x['arrival'])
+    current_time = 0
+    gantt = []
+    ready_queue = []
+    i = 0
+    n = len(tasks)
+
+    while i < n or ready_queue:
+        while i < n and tasks[i]['arrival'] <= current_time:
+            ready_queue.append(tasks[i])
+            i += 1
+
+        if not ready_queue:
+            current_time = tasks[i]['arrival']
+            continue
+
+        ready_queue.sort(key=lambda x: x[field])
+        task = ready_queue.pop(0)
+
+        if task['start'] == -1:
+            task['start'] = current_time
+            task['response'] = current_time - task['arrival']
+
+        gantt.append({'task': task['id'], 'start': current_time, 'end': current_time + task['burst']})
+        current_time += task['burst']
+        task['finish'] = current_time
+
+    return {'tasks': tasks, 'gantt': gantt}
+
+
+def oracle_preemptive(tasks, field):
+    tasks.sort(key=lambda x: x['arrival'])
+    current_time = 0
+    gantt = []
+    ready_queue = []
+    i = 0
+    n = len(tasks)
+    prev_task = None
+
+    for task in tasks:
+        task['remaining'] = task['burst']
+
+    while i < n or ready_queue:
+        while i < n and tasks[i]['arrival'] <= current_time:
+            ready_queue.append(tasks[i])
+            i += 1
+
+        if not ready_queue:
+            current_time = tasks[i]['arrival']
+            continue
+
+        ready_queue.sort(key=lambda x: x[field])
+        task = ready_queue[0]
+
+        if prev_task and prev_task != task and prev_task['remaining'] > 0:
+            gantt.append({'task': prev_task['id'], 'start': prev_task['start_time'], 'end': current_time})
+
+        if prev_task != task:
+            if task['start'] == -1:
+                task['start'] = current_time
+                task['response'] = current_time - task['arrival']
+            task['start_time'] = current_time
+
+        task['remaining'] -= 1
+        current_time += 1
+        prev_task = task
+
+        if task['remaining'] == 0:
+            ready_queue.pop(0)
+            task['finish'] = current_time
+            gantt.append({'task': task['id'], 'start': task['start_time'], 'end': current_time})
+
+    return {'tasks': tasks, 'gantt': gantt}
+
+
+def oracle_round_robin(tasks, quantum):
+    tasks.sort(key=lambda x: x['arrival'])
+    current_time = 0
+    gantt = []
+    ready_queue = []
+    i = 0
+    n = len(tasks)
+
+    for task in tasks:
+        task['remaining'] = task['burst']
+
+    while i < n or ready_queue:
+        while i < n and tasks[i]['arrival'] <= current_time:
+            ready_queue.append(tasks[i])
+            i += 1
+
+        if not ready_queue:
+            current_time = tasks[i]['arrival']
+            continue
+
+        task = ready_queue.pop(0)
+
+        if task['start'] == -1:
+            task['start'] = current_time
+            task['response'] = current_time - task['arrival']
+
+        exec_time = min(quantum, task['remaining'])
+        gantt.append({'task': task['id'], 'start': current_time, 'end': current_time + exec_time})
+
+        current_time += exec_time
+        task['remaining'] -= exec_time
+
+        while i < n and tasks[i]['arrival'] <= current_time:
+            ready_queue.append(tasks[i])
+            i += 1
+
+        if task['remaining'] > 0:
+            ready_queue.append(task)
+        else:
+            task['finish'] = current_time
+
+    return {'tasks': tasks, 'gantt': gantt}
+
+
+ORACLES = {
+    'fcfs': lambda tasks, quantum: oracle_fcfs(tasks),
+    'sjf': lambda tasks, quantum: oracle_non_preemptive(tasks, 'burst'),
+    'priority_non_preemptive': lambda tasks, quantum: oracle_non_preemptive(tasks, 'priority'),
+    'priority_preemptive': lambda tasks, quantum: oracle_preemptive(tasks, 'priority'),
+    'round_robin': oracle_round_robin,
+    'srtf': lambda tasks, quantum: oracle_preemptive(tasks, 'remaining'),
+}
+
+
+def random_tasks(rng):
+    # Small workloads with many ties in arrival, burst and priority; an
+    # arrival range of 0 exercises the closed-form same-arrival paths
+    n = rng.randint(1, 12)
+    max_arrival = rng.choice([0, 3, 20, 60])
+    max_burst = rng.choice([1, 3, 10])
+    max_priority = rng.choice([0, 2, 6])
+    return [{'id': k + 1, 'arrival': rng.randint(0, max_arrival), 'burst': rng.randint(1, max_burst),
+             'priority': rng.randint(0, max_priority), 'remaining': 0, 'start': -1, 'finish': -1,
+             'response': -1}
+            for k in range(n)]
+
+
+def by_id(tasks):
+    return {task['id']: (task['start'], task['finish'], task['response']) for task in tasks}
+
+
+@pytest.mark.parametrize('algorithm', list(ENGINES))
+def test_engine_matches_oracle(algorithm):
+    rng = random.Random(algorithm)
+    for _ in range(300):
+        tasks = random_tasks(rng)
+        quantum = rng.randint(1, 4)
+        table = TaskTable.from_rows((t['id'], t['arrival'], t['burst'], t['priority'])
+                                    for t in tasks)
+        expected = ORACLES[algorithm]([dict(t) for t in tasks], quantum)
+
+        schedule = run(algorithm, table, quantum)
+        assert schedule.gantt.rows() == expected['gantt'], (tasks, quantum)
+        assert by_id(schedule.tasks()) == by_id(expected['tasks']), (tasks, quantum)
+
+
+def drain_time(queue, n):
+    # Seconds to push n tasks in a scrambled order and pop them all
+    keys = random.Random(n).sample(range(n), n)
+    t0 = time.perf_counter()
+    for key in keys:
+        queue.push(key)
+    while queue:
+        queue.pop()
+    return time.perf_counter() - t0
+
+
+@pytest.mark.parametrize('make_queue', [lambda: HeapQueue(lambda task: task), FifoQueue],
+                         ids=['heap', 'fifo'])
+def test_queue_scaling(make_queue):
+    # n pushes and pops stay within O(n log n) up to 10^6 tasks: a hundredfold
+    # larger workload may cost at most ten times 100 * log ratio (cache misses
+    # on the big heap), well below the 10^4 factor a quadratic queue shows
+    small, large = 10 ** 4, 10 ** 6
+    base = min(drain_time(make_queue(), small) for _ in range(3))
+    elapsed = drain_time(make_queue(), large)
+    bound = (large * math.log(large)) / (small * math.log(small))
+    assert elapsed / base < 10 * bound
+
+
+@pytest.mark.parametrize('algorithm', list(ENGINES))
+def test_engine_counters(algorithm):
+    # Every task is pushed once on arrival and once more per preemption, and
+    # pops match pushes by the end; a resumed run counts as the full run does
+    rng = random.Random(algorithm)
+    for _ in range(50):
+        tasks = random_tasks(rng)
+        quantum = rng.randint(1, 4)
+        rows = [(t['id'], t['arrival'], t['burst'], t['priority']) for t in tasks]
+        table = TaskTable.from_rows(rows)
+        counters = engine_counters()
+        schedule = run(algorithm, table, quantum, counters=counters)
+        if algorithm == 'fcfs' or (algorithm in ('sjf', 'priority_non_preemptive') and
+                                   table.arrival.min() == table.arrival.max()):
+            assert counters == engine_counters()
+            continue
+        preemptions = len(schedule.gantt) - len(table)
+        assert counters['queue_pushes'] == counters['queue_pops'] == len(table) + preemptions
+        assert counters['events'] >= len(schedule.gantt)
+
+        runner = IncrementalRunner(algorithm, quantum)
+        runner.run(table)
+        table = TaskTable.from_rows(rows + [(100, 100, 2, 0)])
+        resumed = engine_counters()
+        runner.run(table, counters=resumed)
+        full = engine_counters()
+        run(algorithm, table, quantum, counters=full)
+        assert resumed == full
+
+
+def test_smp_counters_sum_all_queues():
+    table = TaskTable.from_rows((k, k % 7, 3 + k % 5, k % 3) for k in range(200))
+    for stealing in (False, True):
+        counters = engine_counters()
+        schedule = smp(table, 'srtf', 4, stealing=stealing, counters=counters)
+        assert counters['queue_pushes'] == counters['queue_pops'] == len(schedule.gantt)
@@ -0,0 +1,30 @@
+import os
+import random
+
+from scheduler import generate, read_schedule, smp, write_schedule
+from scheduler.metrics import context_switches
+
+
+def test_multicore_window_matches_full_scan():
+    gantt = smp(generate(3000, 5), 'round_robin', 3, 2).gantt
+    rng = random.Random(0)
+    for _ in range(200):
+        t0 = rng.randint(0, int(gantt.end.max()))
+        t1 = t0 + rng.randint(0, 200)
+        window = gantt.window(t0, t1)
+        overlap = (gantt.end > t0) & (gantt.start < t1)
+        assert (sorted(zip(window.core.tolist(), window.start.tolist(), window.task.tolist())) ==
+                sorted(zip(gantt.core[overlap].tolist(), gantt.start[overlap].tolist(),
+                           gantt.task[overlap].tolist())))
+
+
+def test_lanes_of_a_memory_mapped_schedule_are_views(tmp_path):
+    schedule = smp(generate(2000, 1), 'srtf', 4)
+    path = os.path.join(tmp_path, 'srtf.sched')
+    write_schedule(path, schedule, 'srtf')
+    gantt = read_schedule(path).gantt
+    for core in range(gantt.cores):
+        lane = gantt.lane(core)
+        assert lane.task.base is not None
+        assert (lane.start[1:] >= lane.end[:-1]).all()
+    assert context_switches(gantt) == context_switches(schedule.gantt)
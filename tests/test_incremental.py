@@ -0,0 +1,171 @@
+import random
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from scheduler import ENGINES, Checkpoints, IncrementalRunner, TaskTable, run
+from scheduler.algorithms import CHECKPOINT_BYTES
+
+
+def assert_same(resumed, full):
+    assert resumed.gantt.rows() == full.gantt.rows()
+    for column in ('start', 'finish', 'response', 'remaining'):
+        assert getattr(resumed, column).tolist() == getattr(full, column).tolist(), column
+
+
+def random_rows(rng, n, first_id=0):
+    return [(first_id + k, rng.randint(0, 100), rng.randint(1, 8), rng.randint(0, 4))
+            for k in range(n)]
+
+
+def resume_and_compare(runner, algorithm, quantum, rows):
+    # The resumed run on rows must equal a full run from scratch
+    table = TaskTable.from_rows(rows)
+    assert_same(runner.run(table), run(algorithm, table, quantum))
+
+
+@pytest.mark.parametrize('algorithm', list(ENGINES))
+def test_append(algorithm):
+    rng = random.Random(algorithm)
+    resumed = 0
+    for _ in range(40):
+        quantum = rng.randint(1, 3)
+        rows = random_rows(rng, rng.randint(20, 60))
+        runner = IncrementalRunner(algorithm, quantum)
+        runner.run(TaskTable.from_rows(rows))
+
+        # Late arrivals leave a long unchanged prefix to resume from
+        rows.append((10 ** 6, rng.randint(60, 120), rng.randint(1, 8), rng.randint(0, 4)))
+        resume_and_compare(runner, algorithm, quantum, rows)
+        resumed += runner.resumed_at is not None
+    if algorithm != 'fcfs':
+        assert resumed
+
+
+@pytest.mark.parametrize('algorithm', list(ENGINES))
+def test_edit(algorithm):
+    rng = random.Random(algorithm)
+    for _ in range(40):
+        quantum = rng.randint(1, 3)
+        rows = random_rows(rng, rng.randint(20, 60))
+        runner = IncrementalRunner(algorithm, quantum)
+        runner.run(TaskTable.from_rows(rows))
+
+        # Same row and ID; arrival, burst and priority may all move
+        j = rng.randrange(len(rows))
+        rows[j] = (rows[j][0], rng.randint(0, 120), rng.randint(1, 8), rng.randint(0, 4))
+        resume_and_compare(runner, algorithm, quantum, rows)
+
+
+@pytest.mark.parametrize('algorithm', list(ENGINES))
+def test_chained_changes(algorithm):
+    # Every run resumes from checkpoints kept from the run before, itself
+    # possibly resumed
+    rng = random.Random(algorithm)
+    for _ in range(20):
+        quantum = rng.randint(1, 3)
+        rows = random_rows(rng, rng.randint(1, 40))
+        runner = IncrementalRunner(algorithm, quantum)
+        runner.run(TaskTable.from_rows(rows))
+        for step in range(6):
+            if rng.random() < 0.6:
+                rows.append((10 ** 6 + step, rng.randint(0, 120), rng.randint(1, 8),
+                             rng.randint(0, 4)))
+            else:
+                j = rng.randrange(len(rows))
+                rows[j] = (rows[j][0], rng.randint(0, 120), rng.randint(1, 8), rng.randint(0, 4))
+            resume_and_compare(runner, algorithm, quantum, rows)
+            events = [state['events'] for state in runner.checkpoints.items]
+            assert events == sorted(set(events))
+
+
+@pytest.mark.parametrize('algorithm', [name for name in ENGINES if name != 'fcfs'])
+def test_resumed_checkpoints_match_full_run(algorithm):
+    # A checkpoint records events - 1, so the resumed engine's first event
+    # lands on it again: it re-snapshots the state it resumed from, and every
+    # later checkpoint falls where the full run took it
+    table = TaskTable.from_rows(random_rows(random.Random(algorithm), 60))
+    args = (table, 2) if algorithm == 'round_robin' else (table,)
+    full = Checkpoints(len(table))
+    full.interval = 7
+    schedule = ENGINES[algorithm](*args, checkpoints=full)
+    k = len(full.items) // 2
+
+    resumed = Checkpoints(len(table), full.items[:k])
+    resumed.interval = 7
+    ENGINES[algorithm](*args, checkpoints=resumed, resume=(full.items[k], schedule))
+
+    def positions(checkpoints):
+        return [(state['time'], state['i'], state['events'], state['segments'])
+                for state in checkpoints.items]
+    assert positions(resumed) == positions(full)
+
+
+def test_removed_rows_run_from_scratch():
+    rng = random.Random(0)
+    rows = random_rows(rng, 30)
+    runner = IncrementalRunner('srtf')
+    runner.run(TaskTable.from_rows(rows))
+    del rows[5]
+    resume_and_compare(runner, 'srtf', 0, rows)
+    assert runner.resumed_at is None
+
+
+@pytest.mark.parametrize('algorithm', ['sjf', 'priority_non_preemptive'])
+def test_closed_form_fallback(algorithm):
+    # When every task arrives at once SJF and Priority use the closed form,
+    # which keeps no checkpoints: changes after it run from scratch, and a
+    # checkpointed run edited into the same-arrival case ignores them
+    rng = random.Random(algorithm)
+    rows = [(k, 0, rng.randint(1, 8), rng.randint(0, 4)) for k in range(30)]
+    runner = IncrementalRunner(algorithm)
+    runner.run(TaskTable.from_rows(rows))
+    assert not runner.checkpoints.items
+
+    rows.append((100, 50, 3, 1))
+    resume_and_compare(runner, algorithm, 0, rows)
+    assert runner.resumed_at is None
+    assert runner.checkpoints.items
+
+    rows[-1] = (100, 0, 3, 1)
+    resume_and_compare(runner, algorithm, 0, rows)
+
+
+def test_unchanged_table_returns_previous_schedule():
+    rows = random_rows(random.Random(1), 20)
+    runner = IncrementalRunner('round_robin', 2)
+    schedule = runner.run(TaskTable.from_rows(rows))
+    assert runner.run(TaskTable.from_rows(rows)) is schedule
+
+
+def traced_peak(func, *args, **kwargs):
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize('algorithm', ['round_robin', 'srtf', 'sjf'])
+def test_checkpoint_memory_is_bounded(algorithm):
+    # Every task arrives at once, so the whole workload sits in the ready queue
+    # at every checkpoint; the snapshots together stay within their budget
+    n = 10000
+    rng = np.random.default_rng(0)
+    table = TaskTable(np.arange(n), np.r_[0, np.ones(n - 1, dtype=np.int64)],
+                      rng.integers(1, 20, n), rng.integers(0, 5, n))
+    args = (table, 2) if algorithm == 'round_robin' else (table,)
+    budget = 2**19
+    checkpoints = Checkpoints(n, max_bytes=budget)
+
+    base = traced_peak(ENGINES[algorithm], *args)
+    peak = traced_peak(ENGINES[algorithm], *args, checkpoints=checkpoints)
+    assert checkpoints.items
+    assert checkpoints.nbytes <= budget
+    assert peak - base < 2 * budget
+
+    runner = IncrementalRunner(algorithm, 2)
+    runner.run(table)
+    assert runner.checkpoints.nbytes <= CHECKPOINT_BYTES
@@ -0,0 +1,69 @@
+import random
+
+import numpy as np
+import pytest
+
+from scheduler import ENGINES, TaskTable, run, smp
+
+
+def random_table(rng, max_tasks=40):
+    # Ties in arrival, burst and priority are common; an arrival range of 0
+    # puts every task in the ready queue at once
+    n = rng.randint(1, max_tasks)
+    max_arrival = rng.choice([0, 5, 30, 100])
+    max_burst = rng.choice([1, 4, 12])
+    return TaskTable.from_rows((k + 1, rng.randint(0, max_arrival), rng.randint(1, max_burst),
+                                rng.randint(0, 3)) for k in range(n))
+
+
+@pytest.mark.parametrize('algorithm', list(ENGINES))
+def test_one_core_matches_run(algorithm):
+    rng = random.Random(algorithm)
+    for _ in range(200):
+        table = random_table(rng)
+        quantum = rng.randint(1, 4)
+        schedule, expected = smp(table, algorithm, 1, quantum), run(algorithm, table, quantum)
+        assert schedule.gantt.rows() == expected.gantt.rows()
+        for column in ('start', 'finish', 'response'):
+            assert getattr(schedule, column).tolist() == getattr(expected, column).tolist()
+
+
+def by_task(gantt, ids):
+    # Segments of every task as (start, end, core) sorted by start
+    segments = {task: [] for task in ids}
+    for task, start, end, core in zip(gantt.task.tolist(), gantt.start.tolist(),
+                                      gantt.end.tolist(), gantt.core.tolist()):
+        segments[task].append((start, end, core))
+    return {task: sorted(runs) for task, runs in segments.items()}
+
+
+@pytest.mark.parametrize('stealing', [False, True], ids=['shared', 'stealing'])
+@pytest.mark.parametrize('algorithm', list(ENGINES))
+def test_multicore_invariants(algorithm, stealing):
+    rng = random.Random(f'{algorithm}-{stealing}')
+    for _ in range(100):
+        table = random_table(rng)
+        cores = rng.randint(2, 5)
+        schedule = smp(table, algorithm, cores, rng.randint(1, 4), stealing)
+        gantt = schedule.gantt
+        assert gantt.cores == cores
+
+        # No two segments overlap within a lane
+        for core in range(cores):
+            lane = gantt.lane(core)
+            assert (lane.start[1:] >= lane.end[:-1]).all()
+
+        segments = by_task(gantt, table.id.tolist())
+        for task, arrival, burst, start, finish in zip(
+                table.id.tolist(), table.arrival.tolist(), table.burst.tolist(),
+                schedule.start.tolist(), schedule.finish.tolist()):
+            runs = segments[task]
+            # Each task gets exactly its burst of CPU time, never before it
+            # arrives and never on two cores at once
+            assert sum(end - begin for begin, end, _ in runs) == burst
+            assert runs[0][0] >= arrival
+            assert all(runs[k][1] <= runs[k + 1][0] for k in range(len(runs) - 1))
+            assert (runs[0][0], runs[-1][1]) == (start, finish)
+
+        assert (schedule.response == schedule.start - table.arrival).all()
+        assert np.isin(gantt.core, np.arange(cores)).all()
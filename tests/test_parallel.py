@@ -0,0 +1,35 @@
+import time
+
+import pytest
+
+from scheduler import Cancelled, compare, generate, run, summarize, sweep_quantum
+
+
+def test_compare_matches_serial_runs():
+    table = generate(500, 2)
+    metrics = compare(table, ['fcfs', 'srtf', 'round_robin'], quantum=3, max_workers=2)
+    assert metrics == {name: summarize(run(name, table, 3))
+                       for name in ('fcfs', 'srtf', 'round_robin')}
+
+
+@pytest.mark.parametrize('start', [compare, lambda table, progress: sweep_quantum(
+    table, range(1, 7), max_workers=2, progress=progress)], ids=['compare', 'sweep'])
+def test_cancel_stops_workers(start):
+    # Cancelled from the progress callback stops the running workers at their
+    # next progress check instead of letting the pool finish the whole run
+    table = generate(50000, 3)
+    calls = []
+
+    def progress(done, total):
+        calls.append((done, total))
+        if len(calls) > 2:
+            raise Cancelled()
+    t0 = time.perf_counter()
+    with pytest.raises(Cancelled):
+        start(table, progress=progress)
+    cancelled = time.perf_counter() - t0
+    assert calls[0] == (0, 6)
+
+    t0 = time.perf_counter()
+    start(table, progress=None)
+    assert cancelled < time.perf_counter() - t0
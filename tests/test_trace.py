@@ -0,0 +1,176 @@
+import os
+
+import numpy as np
+import pytest
+
+from scheduler import read_events, reconstruct, trace_format
+from scheduler import trace
+from scheduler.trace import SWITCH_DTYPES, WAKEUP_DTYPES, _blocks, _parse_chunk
+
+# Two CPUs, times in microseconds from the first event:
+#   pid 11 wakes at 0, runs on CPU 0 from 10 to 30, is preempted (still
+#   runnable) and resumes on CPU 1 from 50 until it blocks at 60
+#   pid 12 wakes at 15 and runs on CPU 1 from 20 until it blocks at 50
+#   pid 13 is switched in on CPU 0 at 70, but the next switch there names pid
+#   99 as the task going out: a lost event, so neither pair is used
+#   pid 14 runs on CPU 0 from 90 to 95 and is still runnable when the trace ends
+FTRACE = """\
+# tracer: nop
+#
+   kworker/0:1-7       [000] d..3. 100.000000: sched_wakeup: comm=my task pid=11 prio=120 target_cpu=000
+      <idle>-0         [000] d..2. 100.000010: sched_switch: prev_comm=swapper/0 prev_pid=0 prev_prio=120 prev_state=R ==> next_comm=my task next_pid=11 next_prio=120
+   kworker/1:0-8       [001] d..3. 100.000015: sched_wakeup_new: comm=other pid=12 prio=110 target_cpu=001
+      <idle>-0         [001] d..2. 100.000020: sched_switch: prev_comm=swapper/1 prev_pid=0 prev_prio=120 prev_state=R ==> next_comm=other next_pid=12 next_prio=110
+     my task-11        [000] d..2. 100.000030: sched_switch: prev_comm=my task prev_pid=11 prev_prio=120 prev_state=R+ ==> next_comm=swapper/0 next_pid=0 next_prio=120
+       other-12        [001] d..2. 100.000050: sched_switch: prev_comm=other prev_pid=12 prev_prio=110 prev_state=S ==> next_comm=my task next_pid=11 next_prio=120
+     my task-11        [001] d..2. 100.000060: sched_switch: prev_comm=my task prev_pid=11 prev_prio=120 prev_state=D ==> next_comm=swapper/1 next_pid=0 next_prio=120
+      <idle>-0         [000] d..2. 100.000070: sched_switch: prev_comm=swapper/0 prev_pid=0 prev_prio=120 prev_state=R ==> next_comm=lost next_pid=13 next_prio=120
+        gone-99        [000] d..2. 100.000080: sched_switch: prev_comm=gone prev_pid=99 prev_prio=120 prev_state=S ==> next_comm=swapper/0 next_pid=0 next_prio=120
+      <idle>-0         [000] d..2. 100.000090: sched_switch: prev_comm=swapper/0 prev_pid=0 prev_prio=120 prev_state=R ==> next_comm=late next_pid=14 next_prio=120
+        late-14        [000] d..2. 100.000095: sched_switch: prev_comm=late prev_pid=14 prev_prio=120 prev_state=R ==> next_comm=swapper/0 next_pid=0 next_prio=120
+"""
+
+PERF = """\
+     kworker/0:1     7 [000]   100.000000:       sched:sched_wakeup: my task:11 [120] CPU:000
+         swapper     0 [000]   100.000010:       sched:sched_switch: swapper/0:0 [120] R ==> my task:11 [120]
+     kworker/1:0     8 [001]   100.000015:   sched:sched_wakeup_new: other:12 [110] CPU:001
+         swapper     0 [001]   100.000020:       sched:sched_switch: swapper/1:0 [120] R ==> other:12 [110]
+         my task    11 [000]   100.000030:       sched:sched_switch: my task:11 [120] R+ ==> swapper/0:0 [120]
+           other    12 [001]   100.000050:       sched:sched_switch: other:12 [110] S ==> my task:11 [120]
+         my task    11 [001]   100.000060:       sched:sched_switch: my task:11 [120] D ==> swapper/1:0 [120]
+         swapper     0 [000]   100.000070:       sched:sched_switch: swapper/0:0 [120] R ==> lost:13 [120]
+            gone    99 [000]   100.000080:       sched:sched_switch: gone:99 [120] S ==> swapper/0:0 [120]
+         swapper     0 [000]   100.000090:       sched:sched_switch: swapper/0:0 [120] R ==> late:14 [120]
+            late    14 [000]   100.000095:       sched:sched_switch: late:14 [120] R ==> swapper/0:0 [120]
+"""
+
+CSV = """\
+time,cpu,event,prev_pid,prev_prio,prev_state,next_pid,next_prio
+100.000000,0,sched_wakeup,,,,11,120
+100.000010,0,sched_switch,0,120,R,11,120
+100.000015,1,sched_wakeup_new,,,,12,110
+100.000020,1,sched_switch,0,120,R,12,110
+100.000030,0,sched_switch,11,120,R+,0,120
+100.000050,1,sched_switch,12,110,S,11,120
+100.000060,1,sched_switch,11,120,D,0,120
+100.000070,0,sched_switch,0,120,R,13,120
+100.000080,0,sched_switch,99,120,S,0,120
+100.000090,0,sched_switch,0,120,R,14,120
+100.000095,0,sched_switch,14,120,R,0,120
+"""
+
+SAMPLES = {'ftrace': ('trace.txt', FTRACE), 'perf': ('sched.txt', PERF), 'csv': ('sched.csv', CSV)}
+
+
+@pytest.fixture(params=list(SAMPLES))
+def sample(request, tmp_path):
+    name, text = SAMPLES[request.param]
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def test_read_events(sample):
+    switches, wakeups = read_events(sample)
+    time, cpu, prev_pid, prev_runnable, next_pid, next_prio = switches
+    assert [column.dtype for column in switches] == [np.dtype(dtype) for dtype in SWITCH_DTYPES]
+    assert (time - 100_000_000).tolist() == [10, 20, 30, 50, 60, 70, 80, 90, 95]
+    assert cpu.tolist() == [0, 1, 0, 1, 1, 0, 0, 0, 0]
+    assert prev_pid.tolist() == [0, 0, 11, 12, 11, 0, 99, 0, 14]
+    assert prev_runnable.tolist() == [True, True, True, False, False, True, False, True, True]
+    assert next_pid.tolist() == [11, 12, 0, 11, 0, 13, 0, 14, 0]
+    assert next_prio.tolist() == [120, 110, 120, 120, 120, 120, 120, 120, 120]
+    assert [column.dtype for column in wakeups] == [np.dtype(dtype) for dtype in WAKEUP_DTYPES]
+    assert (wakeups[0] - 100_000_000).tolist() == [0, 15]
+    assert wakeups[1].tolist() == [11, 12]
+    assert wakeups[2].tolist() == [120, 110]
+
+
+def test_units(sample):
+    for unit, scale in (('ms', 1), ('us', 1000), ('ns', 10 ** 6)):
+        time = read_events(sample, unit=unit)[0][0]
+        assert time[0] == 100 * scale * 1000 + 10 * scale // 1000
+    with pytest.raises(ValueError):
+        read_events(sample, unit='s')
+
+
+def test_reconstruct(sample):
+    schedule = reconstruct(*read_events(sample))
+    table = schedule.table
+
+    # Jobs numbered by arrival: pid 11 then pid 12; the lost pid 13 and pid 14,
+    # still runnable at the end, are dropped
+    assert table.id.tolist() == [1, 2]
+    assert table.arrival.tolist() == [0, 15]
+    assert table.burst.tolist() == [30, 30]
+    assert table.priority.tolist() == [120, 110]
+    assert schedule.start.tolist() == [10, 20]
+    assert schedule.finish.tolist() == [60, 50]
+    assert schedule.response.tolist() == [10, 5]
+
+    # Pid 11 is preempted on CPU 0 and resumes on CPU 1
+    gantt = schedule.gantt
+    assert gantt.cores == 2
+    assert gantt.rows() == [{'task': 1, 'start': 10, 'end': 30, 'core': 0},
+                            {'task': 2, 'start': 20, 'end': 50, 'core': 1},
+                            {'task': 1, 'start': 50, 'end': 60, 'core': 1}]
+
+
+def test_reconstruct_without_wakeups(tmp_path):
+    # A job's arrival falls back to its first switch-in
+    path = tmp_path / 'trace.txt'
+    path.write_text(''.join(line + '\n' for line in FTRACE.splitlines()
+                            if 'sched_wakeup' not in line))
+    schedule = reconstruct(*read_events(str(path)))
+    assert schedule.table.arrival.tolist() == [0, 10]
+    assert schedule.table.burst.tolist() == [30, 30]
+    assert schedule.response.tolist() == [0, 0]
+
+
+def test_reconstruct_needs_switches(tmp_path):
+    path = tmp_path / 'trace.txt'
+    path.write_text(FTRACE.splitlines()[2] + '\n')
+    with pytest.raises(ValueError):
+        reconstruct(*read_events(str(path)))
+
+
+def read_lines(path, bounds):
+    with open(path, 'rb') as f:
+        return [line for lo, hi in zip(bounds, bounds[1:]) for lines in _blocks(f, lo, hi)
+                for line in lines]
+
+
+def test_blocks_split_on_line_starts(sample, monkeypatch):
+    # However the file is cut, every line is read exactly once, by the range
+    # holding its first byte
+    with open(sample) as f:
+        expected = f.read().splitlines()
+    size = os.path.getsize(sample)
+    monkeypatch.setattr(trace, 'BLOCK_BYTES', 50)
+    for step in (1, 7, 64, 200, size):
+        bounds = list(range(0, size, step)) + [size]
+        assert read_lines(sample, bounds) == expected
+
+
+def same_columns(result, expected):
+    return all((a == b).all() and a.dtype == b.dtype for a, b in zip(result, expected))
+
+
+def test_parse_chunk_blocks(sample, monkeypatch):
+    # Converting the text a few lines at a time gives the same columns
+    fmt = trace_format(sample)
+    header = CSV.splitlines()[0].split(',') if fmt == 'csv' else None
+    size = os.path.getsize(sample)
+    switches, wakeups = _parse_chunk(sample, 0, size, fmt, 6, header)
+    monkeypatch.setattr(trace, 'BLOCK_BYTES', 100)
+    small_switches, small_wakeups = _parse_chunk(sample, 0, size, fmt, 6, header)
+    assert same_columns(small_switches, switches)
+    assert same_columns(small_wakeups, wakeups)
+
+
+def test_read_events_chunks(sample):
+    # Chunks parsed by worker processes and concatenated match one chunk
+    switches, wakeups = read_events(sample)
+    chunked = read_events(sample, max_workers=2, chunk_bytes=300)
+    assert same_columns(chunked[0], switches)
+    assert same_columns(chunked[1], wakeups)
@@ -0,0 +1,47 @@
+import io
+import json
+import random
+
+import pytest
+
+from scheduler import generate, load_workload, write_workload
+from scheduler.workload import _json_records
+
+
+def random_json(rng):
+    # Task lists with extra keys, nested values, strings holding JSON
+    # punctuation and arbitrary whitespace between tokens
+    records = [{'id': k, 'arrival': rng.randint(0, 99), 'burst': rng.randint(1, 9),
+                'priority': rng.randint(0, 3), 'name': rng.choice(['a', 'x ] y', '{,}', '"q"']),
+                'tags': [rng.random(), None, {'n': [k]}][:rng.randint(0, 3)]}
+               for k in range(rng.randint(0, 30))]
+    spaces = [' ', '\n', '\r\n', '\t', '']
+    text = '[' + rng.choice(spaces)
+    text += (rng.choice(spaces) + ',' + rng.choice(spaces)).join(
+        json.dumps(record, indent=rng.choice([None, 2])) for record in records)
+    return records, text + rng.choice(spaces) + ']' + rng.choice(spaces)
+
+
+def test_json_records_match_json_load():
+    rng = random.Random(0)
+    for _ in range(100):
+        records, text = random_json(rng)
+        for block_size in (1, 3, 17, 1000):
+            assert list(_json_records(io.StringIO(text), block_size)) == records
+
+
+@pytest.mark.parametrize('text', ['{"id": 1}', '[{"id": 1} {"id": 2}]', '[{"id": 1}] []',
+                                  '[{"id": 1},]', '[{"id": 1}', ''])
+def test_json_records_reject_malformed(text):
+    with pytest.raises(ValueError):
+        list(_json_records(io.StringIO(text), 4))
+
+
+@pytest.mark.parametrize('suffix', ['.json', '.jsonl', '.csv'])
+def test_workload_round_trip(tmp_path, suffix):
+    table = generate(5000, 3)
+    path = str(tmp_path / ('workload' + suffix))
+    write_workload(path, table)
+    loaded = load_workload(path)
+    for column in ('id', 'arrival', 'burst', 'priority'):
+        assert getattr(loaded, column).tolist() == getattr(table, column).tolist()